@@ -1,8 +1,19 @@
 from django.contrib import admin
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
 from django.utils.html import format_html
 from django.utils import timezone
 from django.db.models import Count
-from .models import Category, Tag, Post, Comment
+from .models import Category, Tag, Post, Comment, ArchivedPost
+from .admin_performance import (
+    CachedRelatedFieldListFilter,
+    PerformanceModeAdmin,
+    PublishedMonthListFilter,
+)
+from .bulk import set_comments_approved, set_post_status
+from .cache import invalidate_post_caches
+from .deletion import soft_delete_posts
+from .search import comment_search_vector, post_search_vector
 
 # Customize admin site branding
 admin.site.site_header = 'Blog Administration'
@@ -12,7 +23,7 @@ admin.site.index_title = 'Welcome to Blog Admin Panel'
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'post_count', 'created_at']
+    list_display = ['name', 'slug', 'badge_preview', 'post_count', 'created_at']
     list_display_links = ['name']
     prepopulated_fields = {'slug': ('name',)}
     search_fields = ['name', 'description']
@@ -28,6 +39,22 @@ class CategoryAdmin(admin.ModelAdmin):
         )
     post_count.short_description = 'Posts'
     
+    def badge_preview(self, obj):
+        if not obj.badge_background:
+            return format_html(
+                '<span style="background-color: #6c757d; color: white; '
+                'padding: 2px 8px; border-radius: 10px;">{}</span>',
+                obj.name
+            )
+        return format_html(
+            '<span style="background: {}; color: {}; '
+            'padding: 2px 8px; border-radius: 10px;">{}</span>',
+            obj.badge_background,
+            '#212529' if obj.badge_text_color == Category.BadgeText.DARK else 'white',
+            obj.name
+        )
+    badge_preview.short_description = 'Badge'
+    
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
         queryset = queryset.annotate(
@@ -49,21 +76,56 @@ class TagAdmin(admin.ModelAdmin):
     post_count.short_description = 'Posts'
 
 
+class RecentCommentsFormSet(BaseInlineFormSet):
+    """Inline formset holding only a post's newest comments.
+
+    Popular posts have far too many comments to render on one page; the
+    rest are reached through the comment changelist instead.
+    """
+    limit = 20
+    
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            comments = super().get_queryset()
+            if self.is_bound:
+                # Save against the comments that were shown, even if newer
+                # ones have arrived since the page was rendered
+                pk_name = self.model._meta.pk.name
+                ids = [
+                    self.data.get(f'{self.add_prefix(i)}-{pk_name}', '')
+                    for i in range(self.initial_form_count())
+                ]
+                ids = [int(pk) for pk in ids if pk.isdigit()]
+            else:
+                ids = list(
+                    comments.order_by('-created_at', '-pk').values_list('pk', flat=True)[:self.limit]
+                )
+            self._queryset = comments.filter(pk__in=ids).order_by('-created_at', '-pk')
+        return self._queryset
+
+
 class CommentInline(admin.TabularInline):
     model = Comment
+    formset = RecentCommentsFormSet
     extra = 0
     fields = ['author', 'content', 'is_approved', 'created_at']
-    readonly_fields = ['created_at']
+    # A select widget per row would list (or look up) users once per comment
+    readonly_fields = ['author', 'created_at']
     can_delete = True
     show_change_link = True
+    verbose_name_plural = f'Latest {RecentCommentsFormSet.limit} comments'
+    
+    def has_add_permission(self, request, obj=None):
+        # Comments are added from the comment admin, where the author is picked
+        return False
     
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.select_related('author')
+        return queryset.select_related('author', 'post')
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(PerformanceModeAdmin):
     list_display = [
         'title',
         'author_name',
@@ -90,17 +152,28 @@ class PostAdmin(admin.ModelAdmin):
         'category__name',
     ]
     prepopulated_fields = {'slug': ('title',)}
+    autocomplete_fields = ['author']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
     list_per_page = 25
     list_select_related = ['author', 'category']
     filter_horizontal = ['tags']  # Better UI for ManyToMany
     
+    # ADMIN_PERFORMANCE_MODE: no date hierarchy, index-backed filters and search
+    performance_list_filter = [
+        'status',
+        'is_featured',
+        'allow_comments',
+        ('category', CachedRelatedFieldListFilter),
+        PublishedMonthListFilter,
+    ]
+    
     readonly_fields = [
         'created_at',
         'updated_at',
         'views_count',
         'published_at',
+        'all_comments',
     ]
     
     fieldsets = (
@@ -125,11 +198,17 @@ class PostAdmin(admin.ModelAdmin):
             ),
             'classes': ('collapse',),
         }),
+        ('Comments', {
+            'fields': ('all_comments',)
+        }),
     )
     
     inlines = [CommentInline]
     
-    actions = ['make_published', 'make_draft', 'feature_posts']
+    actions = ['make_published', 'make_draft', 'feature_posts', 'mark_deleted']
+    
+    def full_text_search_vector(self):
+        return post_search_vector()
     
     # Custom display methods
     
@@ -142,7 +221,9 @@ class PostAdmin(admin.ModelAdmin):
         colors = {
             'draft': '#6c757d',
             'published': '#28a745',
+            'scheduled': '#17a2b8',
             'archived': '#dc3545',
+            'deleted': '#343a40',
         }
         return format_html(
             '<span style="background-color: {}; color: white; '
@@ -169,6 +250,18 @@ class PostAdmin(admin.ModelAdmin):
         return '0'
     comment_count.short_description = 'Comments'
     
+    def all_comments(self, obj):
+        if obj.pk is None:
+            return '-'
+        url = reverse('admin:blog_comment_changelist') + f'?post__id__exact={obj.pk}'
+        return format_html(
+            '{} comment(s); the latest {} are listed below. <a href="{}">View all →</a>',
+            obj.comments.count(),
+            RecentCommentsFormSet.limit,
+            url
+        )
+    all_comments.short_description = 'All comments'
+    
     # Custom actions
     
     def make_published(self, request, queryset):
@@ -186,7 +279,7 @@ class PostAdmin(admin.ModelAdmin):
     make_published.short_description = 'Publish selected posts'
     
     def make_draft(self, request, queryset):
-        updated = queryset.update(status=Post.Status.DRAFT)
+        updated = set_post_status(queryset, Post.Status.DRAFT)
         self.message_user(
             request,
             f'{updated} post(s) set to draft.'
@@ -195,15 +288,26 @@ class PostAdmin(admin.ModelAdmin):
     
     def feature_posts(self, request, queryset):
         updated = queryset.update(is_featured=True)
+        # The home page and featured listing are cached
+        invalidate_post_caches(search=False)
         self.message_user(
             request,
             f'{updated} post(s) marked as featured.'
         )
     feature_posts.short_description = 'Mark as featured'
+    
+    def mark_deleted(self, request, queryset):
+        # Comments and tag links are removed later by purge_deleted
+        deleted = soft_delete_posts(queryset)
+        self.message_user(
+            request,
+            f'{deleted} post(s) marked deleted.'
+        )
+    mark_deleted.short_description = 'Delete selected posts (purged later)'
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(PerformanceModeAdmin):
     list_display = [
         'id',
         'post_title',
@@ -223,6 +327,8 @@ class CommentAdmin(admin.ModelAdmin):
         'post__title',
     ]
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['post']
+    autocomplete_fields = ['author']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
     list_per_page = 50
@@ -230,6 +336,9 @@ class CommentAdmin(admin.ModelAdmin):
     
     actions = ['approve_comments', 'unapprove_comments']
     
+    def full_text_search_vector(self):
+        return comment_search_vector()
+    
     # Custom display methods
     
     def post_title(self, obj):
@@ -261,7 +370,7 @@ class CommentAdmin(admin.ModelAdmin):
     # Custom actions
     
     def approve_comments(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        updated = set_comments_approved(queryset, True)
         self.message_user(
             request,
             f'{updated} comment(s) approved.'
@@ -269,9 +378,25 @@ class CommentAdmin(admin.ModelAdmin):
     approve_comments.short_description = 'Approve selected comments'
     
     def unapprove_comments(self, request, queryset):
-        updated = queryset.update(is_approved=False)
+        updated = set_comments_approved(queryset, False)
         self.message_user(
             request,
             f'{updated} comment(s) unapproved.'
         )
-    unapprove_comments.short_description = 'Unapprove selected comments'
\ No newline at end of file
+    unapprove_comments.short_description = 'Unapprove selected comments'
+
+
+@admin.register(ArchivedPost)
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = ['title', 'author', 'status', 'published_at', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['title', 'slug']
+    ordering = ['-archived_at']
+    list_per_page = 50
+    list_select_related = ['author']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
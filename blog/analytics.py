@@ -0,0 +1,223 @@
+"""Post view analytics: an append-only event log and its rollups.
+
+The view recorder appends one line per post and hour to a log file
+partitioned by UTC day (``ANALYTICS_LOG_DIR/views-YYYYMMDD.log``)::
+
+    <hour as unix time> <post id> <category id or -> <author id> <views>
+
+Appends are single ``write`` calls on a file opened with ``O_APPEND``, so
+several processes can share a log. ``rollup_views`` reads each file from
+its ``AnalyticsCheckpoint`` and adds the views to hourly and daily
+``ViewRollup`` rows per post, author and category, moving the checkpoint
+in the same transaction so no line is counted twice. Reports, the author
+dashboard and the trending job read only the rollups.
+"""
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .cache import get_or_compute
+from .models import AnalyticsCheckpoint, Post, ViewRollup
+
+
+LOG_PREFIX = 'views-'
+
+
+class ViewEventLog:
+    """Day-partitioned, append-only log of post views."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def path_for(self, moment):
+        day = moment.astimezone(dt_timezone.utc)
+        return self.directory / f'{LOG_PREFIX}{day:%Y%m%d}.log'
+
+    def append(self, events):
+        """Append ``(hour, post_id, category_id, author_id, views)`` events."""
+        lines = defaultdict(list)
+        for hour, post_id, category_id, author_id, views in events:
+            category = '-' if category_id is None else category_id
+            lines[self.path_for(hour)].append(
+                f'{int(hour.timestamp())} {post_id} {category} {author_id} {views}\n'
+            )
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path, chunk in lines.items():
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, ''.join(chunk).encode())
+            finally:
+                os.close(fd)
+
+    def files(self):
+        return sorted(self.directory.glob(f'{LOG_PREFIX}*.log'))
+
+
+event_log = ViewEventLog(settings.ANALYTICS_LOG_DIR)
+
+
+def day_start(moment):
+    return timezone.localtime(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_views(now=None):
+    """Roll every unread log line up. Returns the number of views added.
+
+    Run from a single scheduler: concurrent runs fail on the rollup unique
+    constraint and leave their checkpoints where they were.
+    """
+    now = now or timezone.now()
+    total = 0
+    for path in event_log.files():
+        total += _rollup_file(path)
+        _remove_if_finished(path, now)
+
+    # Checkpoints of deleted files are no longer needed
+    names = {path.name for path in event_log.files()}
+    AnalyticsCheckpoint.objects.exclude(log_name__in=names).delete()
+
+    ViewRollup.objects.filter(
+        period=ViewRollup.Period.HOUR,
+        start__lt=now - timedelta(days=settings.ANALYTICS_HOURLY_RETENTION_DAYS),
+    ).delete()
+    return total
+
+
+def _rollup_file(path):
+    with transaction.atomic():
+        checkpoint, _ = AnalyticsCheckpoint.objects.select_for_update().get_or_create(
+            log_name=path.name
+        )
+        with open(path, 'rb') as log:
+            log.seek(checkpoint.offset)
+            data = log.read()
+
+        # A writer may be mid-line; stop at the last complete one
+        data = data[:data.rfind(b'\n') + 1]
+        if not data:
+            return 0
+
+        counts = Counter()
+        for line in data.decode().splitlines():
+            hour_ts, post_id, category_id, author_id, views = line.split()
+            hour = datetime.fromtimestamp(int(hour_ts), tz=dt_timezone.utc)
+            views = int(views)
+            dimensions = [
+                (ViewRollup.Dimension.POST, int(post_id)),
+                (ViewRollup.Dimension.AUTHOR, int(author_id)),
+            ]
+            if category_id != '-':
+                dimensions.append((ViewRollup.Dimension.CATEGORY, int(category_id)))
+            for dimension, object_id in dimensions:
+                counts[ViewRollup.Period.HOUR, dimension, object_id, hour] += views
+                counts[ViewRollup.Period.DAY, dimension, object_id, day_start(hour)] += views
+
+        _add_to_rollups(counts)
+        checkpoint.offset += len(data)
+        checkpoint.save(update_fields=['offset'])
+    return sum(
+        views for (period, dimension, _, _), views in counts.items()
+        if period == ViewRollup.Period.HOUR and dimension == ViewRollup.Dimension.POST
+    )
+
+
+def _add_to_rollups(counts):
+    """Add ``counts`` to existing rollup rows and create the missing ones."""
+    groups = defaultdict(dict)
+    for (period, dimension, object_id, start), views in counts.items():
+        groups[period, dimension][object_id, start] = views
+
+    to_update = []
+    to_create = []
+    for (period, dimension), group in groups.items():
+        existing = ViewRollup.objects.filter(
+            period=period,
+            dimension=dimension,
+            object_id__in={object_id for object_id, _ in group},
+            start__in={start for _, start in group},
+        )
+        for rollup in existing:
+            views = group.pop((rollup.object_id, rollup.start), None)
+            if views is not None:
+                rollup.views += views
+                to_update.append(rollup)
+        to_create += [
+            ViewRollup(period=period, dimension=dimension, object_id=object_id, start=start, views=views)
+            for (object_id, start), views in group.items()
+        ]
+
+    ViewRollup.objects.bulk_update(to_update, ['views'], batch_size=1000)
+    ViewRollup.objects.bulk_create(to_create, batch_size=1000)
+
+
+def _remove_if_finished(path, now):
+    # Leave an hour after the day ends for buffered views still being flushed
+    day = datetime.strptime(path.stem[len(LOG_PREFIX):], '%Y%m%d').replace(tzinfo=dt_timezone.utc)
+    if now < day + timedelta(days=1, hours=1):
+        return
+    offset = AnalyticsCheckpoint.objects.filter(log_name=path.name).values_list('offset', flat=True).first()
+    if offset == path.stat().st_size:
+        path.unlink()
+
+
+def author_dashboard(user, days=30):
+    """Rollup-based view statistics for ``user``'s posts, cached briefly."""
+    def load():
+        today = day_start(timezone.now())
+        since = today - timedelta(days=days - 1)
+
+        daily = dict(
+            ViewRollup.objects.filter(
+                period=ViewRollup.Period.DAY,
+                dimension=ViewRollup.Dimension.AUTHOR,
+                object_id=user.pk,
+                start__gte=since,
+            ).values_list('start', 'views')
+        )
+        daily_views = []
+        for offset in range(days):
+            day = day_start(since + timedelta(days=offset, hours=12))
+            daily_views.append((day, daily.get(day, 0)))
+
+        last_24_hours = ViewRollup.objects.filter(
+            period=ViewRollup.Period.HOUR,
+            dimension=ViewRollup.Dimension.AUTHOR,
+            object_id=user.pk,
+            start__gte=timezone.now() - timedelta(hours=24),
+        ).aggregate(total=Sum('views'))['total'] or 0
+
+        post_totals = list(
+            ViewRollup.objects.filter(
+                period=ViewRollup.Period.DAY,
+                dimension=ViewRollup.Dimension.POST,
+                object_id__in=Post.objects.filter(author=user).values('id'),
+                start__gte=since,
+            ).values('object_id').annotate(total=Sum('views')).order_by('-total')[:20]
+        )
+        titles = Post.objects.in_bulk([row['object_id'] for row in post_totals])
+        top_posts = [
+            (titles[row['object_id']], row['total'])
+            for row in post_totals
+            if row['object_id'] in titles
+        ]
+
+        return {
+            'daily_views': daily_views,
+            'peak_day_views': max(views for _, views in daily_views),
+            'total_views': sum(views for _, views in daily_views),
+            'last_24_hours': last_24_hours,
+            'top_posts': top_posts,
+        }
+
+    return get_or_compute(
+        f'blog:analytics:author:{user.pk}:{days}',
+        load,
+        settings.ANALYTICS_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,103 @@
+"""Archival tiering: move cold posts and their comments out of the hot tables.
+
+Post revisions stay where they are: they are keyed by post id, which the
+archive copy keeps, so ``blog.revisions`` serves both tiers.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from .authors import invalidate_author_stats
+from .cache import invalidate_post_caches
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+from .tags import refresh_tag_stats
+
+
+DEFAULT_BATCH_SIZE = 200
+COMMENT_CHUNK_SIZE = 1000
+
+
+def archive_posts(untouched_before=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Move archived posts to the archive tables in batches.
+
+    When ``untouched_before`` is given, published posts not updated since
+    then are moved as well; drafts, scheduled and deleted posts are never
+    moved, since only published archive copies can be reached again. Each
+    batch is copied and removed inside one transaction, so a post is never
+    visible in both tiers. Returns the number of posts archived.
+    """
+    candidates = Q(status=Post.Status.ARCHIVED)
+    if untouched_before is not None:
+        candidates |= Q(status=Post.Status.PUBLISHED, updated_at__lt=untouched_before)
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            posts = list(
+                Post.objects.filter(candidates)
+                .select_for_update(skip_locked=True)
+                .order_by('id')[:batch_size]
+            )
+            if not posts:
+                break
+            tag_ids = _move_batch(posts)
+
+        archived += len(posts)
+        invalidate_post_caches()
+        invalidate_author_stats(post.author_id for post in posts)
+        refresh_tag_stats(tag_ids)
+
+        if len(posts) < batch_size:
+            break
+
+    return archived
+
+
+def get_archived_post(slug):
+    """Return the published archive copy for ``slug``, or ``None``."""
+    return (
+        ArchivedPost.objects.select_related('author', 'category')
+        .prefetch_related('tags')
+        .filter(slug=slug, status=Post.Status.PUBLISHED)
+        .first()
+    )
+
+
+def _move_batch(posts):
+    post_ids = [post.id for post in posts]
+
+    ArchivedPost.objects.bulk_create(
+        [_copy_fields(post, ArchivedPost) for post in posts]
+    )
+
+    tag_links = Post.tags.through.objects.filter(post_id__in=post_ids)
+    links = list(tag_links.values_list('post_id', 'tag_id'))
+    ArchivedPost.tags.through.objects.bulk_create([
+        ArchivedPost.tags.through(archivedpost_id=post_id, tag_id=tag_id)
+        for post_id, tag_id in links
+    ])
+
+    comments = Comment.objects.filter(post_id__in=post_ids).order_by('id')
+    last_id = 0
+    while True:
+        chunk = list(comments.filter(id__gt=last_id)[:COMMENT_CHUNK_SIZE])
+        if not chunk:
+            break
+        ArchivedComment.objects.bulk_create(
+            [_copy_fields(comment, ArchivedComment) for comment in chunk]
+        )
+        last_id = chunk[-1].id
+
+    comments.delete()
+    tag_links.delete()
+    Post.objects.filter(id__in=post_ids).delete()
+
+    return {tag_id for _, tag_id in links}
+
+
+def _copy_fields(source, model):
+    """Build a ``model`` instance from the matching columns of ``source``."""
+    return model(**{
+        field.attname: getattr(source, field.attname)
+        for field in model._meta.concrete_fields
+        if hasattr(source, field.attname)
+    })
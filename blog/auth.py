@@ -0,0 +1,36 @@
+"""Authentication backend that serves the per-request user lookup from cache.
+
+``AuthenticationMiddleware`` asks the session's backend for the user on
+every request. ``CachedModelBackend`` answers from the cache, loading the
+user together with their profile on a miss, and the signals in
+``blog.signals`` drop the entry whenever the user or profile is saved or
+deleted. Django still verifies the session auth hash against the cached
+user, so password changes and logouts take effect immediately.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f'blog:user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` with a cached ``get_user``."""
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = User.objects.select_related('profile').get(pk=user_id)
+            except User.DoesNotExist:
+                return None
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,153 @@
+"""Author statistics, the author directory and the navbar author list.
+
+``with_stats`` annotates a ``User`` queryset with published post, view and
+approved comment totals using correlated subqueries, so any number of
+authors costs one query instead of a few ``COUNT`` queries each.
+``author_stats`` caches one author's totals and top posts until one of
+their posts changes (see ``blog.signals``) or ``AUTHOR_STATS_CACHE_TIMEOUT``
+passes; view counts are only as fresh as that timeout.
+
+The directory is paged by username with a cursor and bucketed by initial;
+prefix lookups (``username__istartswith``) use the ``UPPER(username)``
+pattern index added in migration 0011.
+"""
+import hashlib
+from collections import Counter
+from string import ascii_uppercase
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Substr, Upper
+
+from .cache import get_or_compute, versioned_key
+from .models import Comment, Post
+
+
+TOP_POSTS = 5
+
+
+def _author_total(queryset, author_field, aggregate):
+    """Correlated subquery returning ``aggregate`` over ``queryset`` per author."""
+    subquery = queryset.filter(**{author_field: OuterRef('pk')}).order_by().values(
+        author_field
+    ).annotate(total=aggregate).values('total')
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def with_stats(users):
+    """Annotate ``users`` with ``post_count``, ``total_views`` and ``comment_count``."""
+    published = Post.objects.filter(status=Post.Status.PUBLISHED)
+    approved_comments = Comment.objects.filter(
+        is_approved=True,
+        post__status=Post.Status.PUBLISHED,
+    )
+    return users.annotate(
+        post_count=_author_total(published, 'author', Count('pk')),
+        total_views=_author_total(published, 'author', Sum('views_count')),
+        comment_count=_author_total(approved_comments, 'post__author', Count('pk')),
+    )
+
+
+def stats_cache_key(author_id):
+    return f'blog:author:{author_id}:stats'
+
+
+def invalidate_author_stats(author_ids):
+    cache.delete_many([stats_cache_key(author_id) for author_id in set(author_ids)])
+
+
+def author_stats(author):
+    """Cached totals and most-viewed published posts for ``author``."""
+    def load():
+        totals = with_stats(User.objects.filter(pk=author.pk)).values(
+            'post_count', 'total_views', 'comment_count'
+        ).get()
+        top_posts = list(
+            Post.objects.filter(author=author, status=Post.Status.PUBLISHED)
+            .only('title', 'slug', 'views_count')
+            .order_by('-views_count')[:TOP_POSTS]
+        )
+        return {**totals, 'top_posts': top_posts}
+
+    return get_or_compute(stats_cache_key(author.pk), load, settings.AUTHOR_STATS_CACHE_TIMEOUT)
+
+
+def published_authors():
+    """Users with at least one published post."""
+    return User.objects.filter(
+        Exists(Post.objects.filter(author=OuterRef('pk'), status=Post.Status.PUBLISHED))
+    )
+
+
+def letter_of(username):
+    first = username[:1].upper()
+    return first if first in ascii_uppercase else '#'
+
+
+def letter_counts():
+    """Number of published authors under each directory letter."""
+    def load():
+        counts = Counter()
+        initials = published_authors().annotate(
+            initial=Upper(Substr('username', 1, 1))
+        ).values('initial').annotate(total=Count('pk')).order_by()
+        for row in initials:
+            counts[letter_of(row['initial'])] += row['total']
+        return dict(counts)
+
+    return get_or_compute(versioned_key('author_letters'), load, settings.AUTHOR_DIRECTORY_CACHE_TIMEOUT)
+
+
+def directory_page(letter=None, after='', page_size=48):
+    """One page of the author directory, ordered case-insensitively by username.
+
+    ``letter`` is ``A``-``Z`` or ``#`` for anything else; ``after`` is the
+    last username of the previous page. Returns ``(authors, next_cursor)``.
+    """
+    authors = published_authors().annotate(name_key=Upper('username'))
+    if letter == '#':
+        authors = authors.exclude(username__iregex=r'^[a-z]')
+    elif letter:
+        authors = authors.filter(username__istartswith=letter)
+    if after:
+        authors = authors.filter(
+            Q(name_key__gt=after.upper()) | Q(name_key=after.upper(), username__gt=after)
+        )
+
+    page = list(
+        with_stats(authors.select_related('profile'))
+        .order_by('name_key', 'username')[:page_size + 1]
+    )
+    next_cursor = page[page_size - 1].username if len(page) > page_size else None
+    return page[:page_size], next_cursor
+
+
+def autocomplete(prefix, limit=10):
+    """Published authors whose username starts with ``prefix``."""
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+
+    def load():
+        return list(
+            published_authors().filter(username__istartswith=prefix)
+            .order_by(Upper('username'), 'username').values_list('username', flat=True)[:limit]
+        )
+
+    key = versioned_key('author_prefix', hashlib.md5(prefix.lower().encode()).hexdigest(), limit)
+    return get_or_compute(key, load, settings.AUTHOR_DIRECTORY_CACHE_TIMEOUT)
+
+
+def nav_authors():
+    """The authors with the most published posts, for the navbar."""
+    def load():
+        return list(
+            User.objects.filter(posts__status=Post.Status.PUBLISHED)
+            .annotate(published_count=Count('posts'))
+            .order_by('-published_count', 'username')
+            .values_list('username', flat=True)[:settings.NAV_AUTHORS_SIZE]
+        )
+
+    return get_or_compute(versioned_key('nav_authors'), load, settings.AUTHOR_DIRECTORY_CACHE_TIMEOUT)
@@ -0,0 +1,92 @@
+"""In-process write buffers flushed to the database in batches.
+
+``BufferedWriter`` collects items from request threads and hands them to
+``write`` in one batch: as soon as ``batch_size`` items (or distinct keys)
+are buffered, ``flush_interval`` seconds after the first one otherwise,
+and on interpreter exit once the subclass's instance is registered with
+``atexit``. This is a local stand-in for a message broker, used by the
+comment queue, the view recorder and the search query log.
+"""
+import logging
+import threading
+from collections import Counter
+
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """Thread-safe buffer that writes its contents in batches.
+
+    The default buffer is a ``Counter``: each added key is counted, and
+    the batch size is the number of distinct keys. Subclasses implement
+    ``write`` and may swap the buffer type by overriding ``buffer_class``,
+    ``append`` and ``restore``.
+    """
+    buffer_class = Counter
+
+    def __init__(self, batch_size=500, flush_interval=10.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = self.buffer_class()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def append(self, pending, item):
+        pending[item] += 1
+
+    def restore(self, pending, batch):
+        """Put a batch that failed to write back in front of newer items."""
+        pending.update(batch)
+
+    def write(self, batch):
+        """Write ``batch`` to the database. Returns the number of items written."""
+        raise NotImplementedError
+
+    def add(self, item):
+        """Buffer ``item``, flushing if the buffer is full."""
+        with self._lock:
+            self.append(self._pending, item)
+            full = len(self._pending) >= self.batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            try:
+                self.flush()
+            except Exception:
+                # The batch stays buffered; the request that filled it shouldn't fail
+                logger.exception('Could not flush %s', type(self).__name__)
+
+    def flush(self):
+        """Write everything buffered so far. Returns the number of items written."""
+        with self._lock:
+            batch = self._pending
+            self._pending = self.buffer_class()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not batch:
+            return 0
+        try:
+            return self.write(batch)
+        except Exception:
+            # Keep the batch for the next flush rather than dropping it
+            with self._lock:
+                self.restore(self._pending, batch)
+            raise
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own connection; don't leak it
+            connections.close_all()
@@ -0,0 +1,75 @@
+"""Bulk status changes for posts and comments that keep derived data in step.
+
+A queryset ``update()`` skips the ``blog.signals`` receivers that maintain
+the archive month counts, tag counts and co-occurrence, the cache versions
+and author stats. These helpers update in batches and then bring all of
+those up to date once per batch, as ``publish_due_posts`` does.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .authors import invalidate_author_stats
+from .cache import invalidate_post_caches
+from .date_archive import adjust_month_buckets, months_for_posts
+from .models import Post
+from .tags import refresh_tag_stats, tag_ids_for_posts
+
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def set_post_status(posts, status, batch_size=DEFAULT_BATCH_SIZE):
+    """Move the posts in the queryset ``posts`` to ``status``. Returns the number moved.
+
+    Publish dates are left alone, so publish posts with ``Post.save`` or
+    ``publish_due_posts``, which fill them in.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                posts.exclude(status=status)
+                .select_for_update()
+                .order_by('id')
+                .values_list('id', 'author_id', 'status')[:batch_size]
+            )
+            if not rows:
+                break
+            post_ids = [post_id for post_id, _, _ in rows]
+            before = months_for_posts(post_ids)
+            Post.objects.filter(id__in=post_ids).update(
+                status=status,
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+            after = months_for_posts(post_ids)
+            published_changed = status == Post.Status.PUBLISHED or any(
+                old_status == Post.Status.PUBLISHED for _, _, old_status in rows
+            )
+            tag_ids = tag_ids_for_posts(post_ids) if published_changed else set()
+
+        moved += len(rows)
+        # Only published posts are searchable or counted by month and tag
+        invalidate_post_caches(search=published_changed)
+        invalidate_author_stats(author_id for _, author_id, _ in rows)
+        refresh_tag_stats(tag_ids)
+        after.subtract(before)
+        adjust_month_buckets(after)
+
+        if len(rows) < batch_size:
+            break
+
+    return moved
+
+
+def set_comments_approved(comments, approved):
+    """Approve (or unapprove) the comments in the queryset ``comments``. Returns the number changed."""
+    comments = comments.exclude(is_approved=approved)
+    author_ids = list(comments.values_list('post__author_id', flat=True).distinct())
+    updated = comments.update(is_approved=approved)
+    if updated:
+        # Post pages list approved comments; author stats count them
+        invalidate_post_caches(search=False)
+        invalidate_author_stats(author_ids)
+    return updated
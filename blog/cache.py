@@ -0,0 +1,264 @@
+"""Cache helpers shared by the blog views and background jobs."""
+import hashlib
+import math
+import random
+import threading
+import time
+import weakref
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+POSTS_VERSION_KEY = 'blog:posts:version'
+# Search results only depend on a few post fields, so they get their own
+SEARCH_VERSION_KEY = 'blog:search:version'
+
+# Sent by the warm_cache command so warm-up renders aren't counted as views
+WARMUP_HEADER = 'X-Cache-Warmup'
+
+
+def get_version(version_key):
+    """Return the current generation of the entries keyed on ``version_key``."""
+    return cache.get_or_set(version_key, _new_version, timeout=None)
+
+
+def bump_version(version_key):
+    """Expire every entry keyed on ``version_key`` with a single cache write."""
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, _new_version(), timeout=None)
+
+
+def posts_version():
+    """Return the current generation of post-derived cache entries."""
+    return get_version(POSTS_VERSION_KEY)
+
+
+def invalidate_post_caches(search=True):
+    """Expire every cached listing, feed and stats entry built from posts.
+
+    Entries are keyed on the posts version, so bumping it is a single
+    cache write no matter how many keys depend on it. Pass ``search=False``
+    when no searchable post data (see ``blog.search``) changed, to keep
+    cached search results.
+    """
+    bump_version(POSTS_VERSION_KEY)
+    if search:
+        invalidate_search_caches()
+
+
+def invalidate_search_caches():
+    """Expire every cached search result."""
+    bump_version(SEARCH_VERSION_KEY)
+
+
+def _new_version():
+    # Seed from the clock so an evicted counter never reuses old versions
+    return int(time.time() * 1000)
+
+
+def versioned_key(*parts):
+    """Build a cache key that expires along with the posts version."""
+    return ':'.join(['blog', str(posts_version()), *map(str, parts)])
+
+
+def search_key(*parts):
+    """Build a cache key that expires along with the search version."""
+    return ':'.join(['blog:search', str(get_version(SEARCH_VERSION_KEY)), *map(str, parts)])
+
+
+# ------------------ STAMPEDE PROTECTION ------------------
+
+
+class _KeyLock:
+    """Weak-referenceable holder, so idle per-key locks are freed."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+
+_key_locks = weakref.WeakValueDictionary()
+_key_locks_guard = threading.Lock()
+
+
+def _local_lock(key):
+    with _key_locks_guard:
+        holder = _key_locks.get(key)
+        if holder is None:
+            holder = _key_locks[key] = _KeyLock()
+        return holder
+
+
+def _should_refresh(expires_at, compute_time, beta):
+    """Probabilistic early expiry.
+
+    The closer an entry is to expiring, and the longer it took to build,
+    the likelier a request is to rebuild it ahead of time, so a hot key is
+    refreshed by one request instead of all of them at the deadline.
+    """
+    jitter = -compute_time * beta * math.log(1.0 - random.random())
+    return time.time() + jitter >= expires_at
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None, beta=1.0):
+    """Return the cached value for ``key``, running ``compute`` at most once at a time.
+
+    Entries outlive ``timeout`` by ``stale_timeout`` seconds. While one
+    request rebuilds an expired (or nearly expired) entry, concurrent
+    requests are served the previous value. On a cold miss, requests in
+    this process queue on a per-key lock and other processes poll behind a
+    shared lock in the cache, so the underlying queries run once.
+
+    Exceptions raised by ``compute`` propagate and nothing is stored.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, compute_time = entry
+        if not _should_refresh(expires_at, compute_time, beta):
+            return value
+
+        # Someone else is already rebuilding it; the stale copy will do
+        holder = _local_lock(key)
+        if not holder.lock.acquire(blocking=False):
+            return value
+        try:
+            if not _acquire_shared_lock(key):
+                return value
+            try:
+                return _compute_and_store(key, compute, timeout, stale_timeout)
+            finally:
+                _release_shared_lock(key)
+        finally:
+            holder.lock.release()
+
+    holder = _local_lock(key)
+    with holder.lock:
+        # The request we queued behind may have filled it
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+
+        locked = _acquire_shared_lock(key)
+        if not locked:
+            entry = _wait_for_entry(key)
+            if entry is not None:
+                return entry[0]
+            # The other process failed or timed out; build it ourselves,
+            # taking the lock over if it has gone
+            locked = _acquire_shared_lock(key)
+        try:
+            return _compute_and_store(key, compute, timeout, stale_timeout)
+        finally:
+            # Never delete a lock another process still holds
+            if locked:
+                _release_shared_lock(key)
+
+
+def store(key, compute, timeout, stale_timeout=None):
+    """Run ``compute`` now and cache its result for later ``get_or_compute`` calls.
+
+    For background jobs that refresh entries before anyone asks for them.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    return _compute_and_store(key, compute, timeout, stale_timeout)
+
+
+def _compute_and_store(key, compute, timeout, stale_timeout):
+    started = time.monotonic()
+    value = compute()
+    compute_time = time.monotonic() - started
+    cache.set(key, (value, time.time() + timeout, compute_time), timeout + stale_timeout)
+    return value
+
+
+def _acquire_shared_lock(key):
+    return cache.add(f'{key}:lock', 1, settings.CACHE_LOCK_TIMEOUT)
+
+
+def _release_shared_lock(key):
+    cache.delete(f'{key}:lock')
+
+
+def _wait_for_entry(key, poll_interval=0.05):
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(f'{key}:lock') is None:
+            return None
+    return None
+
+
+# ------------------ PAGE CACHE ------------------
+
+
+class _UncacheableResponse(Exception):
+    """Carries a response that must not be stored out of ``get_or_compute``."""
+
+    def __init__(self, response):
+        self.response = response
+
+
+def page_cache_key(path):
+    digest = hashlib.md5(path.encode()).hexdigest()
+    return versioned_key('page', digest)
+
+
+def is_cacheable_request(request):
+    """Only anonymous, cookie-less GETs share cached pages.
+
+    Checking for the session and messages cookies keeps logged-in pages and
+    pending flash messages out of the cache without touching the database.
+    """
+    return (
+        request.method in ('GET', 'HEAD')
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and 'messages' not in request.COOKIES
+    )
+
+
+def cache_public_page(view):
+    """Serve anonymous requests for ``view`` from the page cache.
+
+    Pages are keyed on the posts version, so any post change expires them
+    all at once; ``PAGE_CACHE_TIMEOUT`` bounds how stale other data can get.
+    Misses go through ``get_or_compute``, so a popular page is rendered
+    once however many requests arrive for it together.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return view(request, *args, **kwargs)
+
+        def render():
+            response = view(request, *args, **kwargs)
+            if (
+                response.status_code != 200
+                or response.streaming
+                or response.cookies
+                # Pages carrying a CSRF token are tied to this client's cookie
+                or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            ):
+                raise _UncacheableResponse(response)
+            return response.content, response['Content-Type']
+
+        try:
+            content, content_type = get_or_compute(
+                page_cache_key(request.get_full_path()),
+                render,
+                settings.PAGE_CACHE_TIMEOUT,
+            )
+        except _UncacheableResponse as uncacheable:
+            return uncacheable.response
+        return HttpResponse(content, content_type=content_type)
+    return wrapper
@@ -0,0 +1,74 @@
+"""Write-optimized queue for incoming comments.
+
+Comment submissions are buffered in process and written with one
+``bulk_create`` per batch instead of one ``INSERT`` per request (see
+``blog.buffering``): a batch is flushed as soon as it is full, after
+``COMMENT_QUEUE_FLUSH_INTERVAL`` seconds otherwise, and on interpreter
+exit.
+
+A batch the database rejects (say, one comment on a post purged while it
+was queued) is retried row by row and the rejected rows are logged and
+dropped, so one bad comment never holds up the rest.
+"""
+import atexit
+import logging
+from collections import deque
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .buffering import BufferedWriter
+from .models import Comment
+
+
+logger = logging.getLogger(__name__)
+
+
+class CommentQueue(BufferedWriter):
+    """Thread-safe buffer that batch-inserts queued comments."""
+    buffer_class = deque
+
+    def __init__(self, batch_size=100, flush_interval=2.0):
+        super().__init__(batch_size, flush_interval)
+
+    def append(self, pending, item):
+        pending.append(item)
+
+    def restore(self, pending, batch):
+        pending.extendleft(reversed(batch))
+
+    def put(self, post_id, author_id, content):
+        """Queue a comment for insertion; it is stored unapproved."""
+        self.add(Comment(post_id=post_id, author_id=author_id, content=content))
+
+    def write(self, batch):
+        batch = list(batch)
+        try:
+            with transaction.atomic():
+                Comment.objects.bulk_create(batch, batch_size=self.batch_size)
+        except IntegrityError:
+            return _insert_one_by_one(batch)
+        return len(batch)
+
+
+def _insert_one_by_one(batch):
+    written = 0
+    for comment in batch:
+        try:
+            with transaction.atomic():
+                comment.save(force_insert=True)
+        except IntegrityError:
+            logger.warning(
+                'Dropped a queued comment on post %s by user %s', comment.post_id, comment.author_id,
+                exc_info=True,
+            )
+        else:
+            written += 1
+    return written
+
+
+comment_queue = CommentQueue(
+    batch_size=settings.COMMENT_QUEUE_BATCH_SIZE,
+    flush_interval=settings.COMMENT_QUEUE_FLUSH_INTERVAL,
+)
+atexit.register(comment_queue.flush)
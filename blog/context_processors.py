@@ -0,0 +1,12 @@
+from django.utils.functional import SimpleLazyObject
+
+from .authors import nav_authors
+from .date_archive import recent_archive_months
+
+
+def navigation(request):
+    """Navbar and sidebar data shared by every page; looked up only if a template uses it."""
+    return {
+        'nav_authors': SimpleLazyObject(nav_authors),
+        'archive_months': SimpleLazyObject(recent_archive_months),
+    }
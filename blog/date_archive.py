@@ -0,0 +1,107 @@
+"""Year and month archive of published posts.
+
+``MonthBucket`` holds the number of published posts per month, so the
+archive index, year pages and the sidebar widget never count posts.
+Buckets are adjusted by one as posts are published, unpublished, moved
+to another month or deleted (see ``blog.signals``), and by whole batches
+in ``publish_due_posts``; ``rebuild_month_buckets`` recounts everything
+in case bulk updates elsewhere let them drift.
+
+Archive pages select posts with half-open ``published_at`` ranges rather
+than ``__year``/``__month`` lookups, so the ``(status, published_at)``
+index serves them.
+"""
+from collections import Counter
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .cache import get_or_compute, versioned_key
+from .models import MonthBucket, Post
+
+
+def month_of(moment):
+    """First day of the (site time zone) month ``moment`` falls in."""
+    local = timezone.localtime(moment)
+    return date(local.year, local.month, 1)
+
+
+def month_range(year, month=None):
+    """Aware ``[start, end)`` bounds of a month, or of a whole year."""
+    if month:
+        start, end = datetime(year, month, 1), datetime(year + month // 12, month % 12 + 1, 1)
+    else:
+        start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def published_in(start, end):
+    return Post.objects.filter(
+        status=Post.Status.PUBLISHED,
+        published_at__gte=start,
+        published_at__lt=end,
+    )
+
+
+def adjust_month_buckets(deltas):
+    """Add ``deltas`` (a mapping of month to post count change) to the buckets."""
+    deltas = {month: delta for month, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        MonthBucket.objects.bulk_create(
+            [MonthBucket(month=month) for month in deltas],
+            ignore_conflicts=True,
+        )
+        for month, delta in deltas.items():
+            MonthBucket.objects.filter(month=month).update(post_count=F('post_count') + delta)
+
+
+def months_for_posts(post_ids):
+    """How many of the given published posts fall in each month."""
+    return Counter(
+        month_of(published_at)
+        for published_at in Post.objects.filter(
+            id__in=post_ids,
+            status=Post.Status.PUBLISHED,
+        ).values_list('published_at', flat=True)
+        if published_at is not None
+    )
+
+
+def rebuild_month_buckets():
+    """Recount every month from the posts table. Returns the number of months."""
+    counts = {
+        row['month'].date(): row['total']
+        for row in Post.objects.filter(
+            status=Post.Status.PUBLISHED,
+            published_at__isnull=False,
+        ).annotate(month=TruncMonth('published_at')).values('month').annotate(
+            total=Count('id')
+        ).order_by()
+    }
+    with transaction.atomic():
+        MonthBucket.objects.all().delete()
+        MonthBucket.objects.bulk_create(
+            [MonthBucket(month=month, post_count=total) for month, total in counts.items()]
+        )
+    return len(counts)
+
+
+def archive_months():
+    """``(month, post_count)`` for every month with published posts, newest first."""
+    def load():
+        return list(
+            MonthBucket.objects.filter(post_count__gt=0).values_list('month', 'post_count')
+        )
+
+    return get_or_compute(versioned_key('archive_months'), load, settings.ARCHIVE_CACHE_TIMEOUT)
+
+
+def recent_archive_months():
+    """The newest months for the sidebar widget."""
+    return archive_months()[:settings.ARCHIVE_WIDGET_MONTHS]
@@ -0,0 +1,101 @@
+"""Soft deletion of posts and accounts, and the batched purge behind it.
+
+Deleting a post only flips its status to ``deleted``: it drops out of
+every published listing at once, exactly like being unpublished, and its
+comments and tag links stay where they are. Closing an account
+deactivates the user, stamps ``UserProfile.deleted_at`` and soft-deletes
+their posts the same way.
+
+The ``purge_deleted`` command then removes the rows for good. Comments,
+tag links, revisions and archived copies go in chunks of ``CHUNK_SIZE``
+rows, one short statement each, before the posts and users themselves,
+so a post with thousands of comments never holds thousands of row locks
+at once.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .bulk import set_post_status
+from .models import ArchivedComment, ArchivedPost, Comment, Post, PostRevision, UserProfile
+from .tags import TagLink
+
+
+DEFAULT_BATCH_SIZE = 100
+CHUNK_SIZE = 1000
+
+
+def soft_delete_posts(posts, batch_size=DEFAULT_BATCH_SIZE):
+    """Mark the posts in the queryset ``posts`` deleted. Returns the number marked."""
+    return set_post_status(posts, Post.Status.DELETED, batch_size)
+
+
+def close_account(user):
+    """Deactivate ``user`` and soft-delete their posts, leaving the rest to the purge."""
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        UserProfile.objects.update_or_create(user=user, defaults={'deleted_at': timezone.now()})
+    soft_delete_posts(Post.objects.filter(author=user))
+
+
+def purge_deleted(batch_size=DEFAULT_BATCH_SIZE, chunk_size=CHUNK_SIZE):
+    """Remove deleted posts and closed accounts for good.
+
+    Returns ``(posts, accounts)``, the numbers of each purged.
+    """
+    accounts = list(User.objects.filter(profile__deleted_at__isnull=False))
+    for user in accounts:
+        # Posts restored by an admin since the account was closed go too
+        soft_delete_posts(Post.objects.filter(author=user), batch_size)
+
+    posts = 0
+    while True:
+        post_ids = list(
+            Post.objects.filter(status=Post.Status.DELETED)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not post_ids:
+            break
+        # Joining the post skips any that were restored in the meantime
+        still_deleted = {'post_id__in': post_ids, 'post__status': Post.Status.DELETED}
+        _delete_in_chunks(Comment.objects.filter(**still_deleted), chunk_size)
+        _delete_in_chunks(TagLink.objects.filter(**still_deleted), chunk_size)
+        _delete_in_chunks(PostRevision.objects.filter(**still_deleted), chunk_size)
+        with transaction.atomic():
+            # Anything left (say, a comment queued just before the delete)
+            # is small enough for the regular cascade
+            Post.objects.filter(id__in=post_ids, status=Post.Status.DELETED).delete()
+        posts += len(post_ids)
+        if len(post_ids) < batch_size:
+            break
+
+    for user in accounts:
+        _delete_in_chunks(Comment.objects.filter(author=user), chunk_size)
+        _delete_in_chunks(ArchivedComment.objects.filter(author=user), chunk_size)
+        _delete_in_chunks(ArchivedComment.objects.filter(post__author=user), chunk_size)
+        _delete_in_chunks(
+            PostRevision.objects.filter(post_id__in=ArchivedPost.objects.filter(author=user).values('id')),
+            chunk_size,
+        )
+        _delete_in_chunks(
+            ArchivedPost.tags.through.objects.filter(archivedpost__author=user),
+            chunk_size,
+        )
+        _delete_in_chunks(ArchivedPost.objects.filter(author=user), chunk_size)
+        user.delete()
+
+    return posts, len(accounts)
+
+
+def _delete_in_chunks(queryset, chunk_size):
+    """Delete the rows of ``queryset`` at most ``chunk_size`` at a time."""
+    model = queryset.model
+    while True:
+        ids = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return
+        model._default_manager.filter(pk__in=ids).delete()
+        if len(ids) < chunk_size:
+            return
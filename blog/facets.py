@@ -0,0 +1,151 @@
+"""Faceted filtering of published posts for the search page.
+
+Posts can be narrowed by category, tag, author, year and month, on their
+own or on top of a text query. Each facet's counts come from one grouped
+query over the matching posts with every *other* filter applied, so the
+alternatives to the current choice stay visible; a text query limits the
+grouping to its (capped) result ids. Counts are cached per normalised
+query and filter set under the search version (see ``blog.search``).
+
+Without a text query results are newest first and paged with a post id
+cursor, as on the tag pages; with one they keep their search ranking and
+the cursor is the last post id shown.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef
+from django.db.models.functions import TruncMonth, TruncYear
+
+from .cache import get_or_compute, search_key
+from .date_archive import month_range
+from .models import Post
+from .search import normalise_query, search_ids
+
+
+FACETS = ('category', 'tag', 'author', 'year', 'month')
+# Most common values shown for the open-ended facets
+FACET_SIZE = 10
+
+
+def parse_filters(params):
+    """Valid facet filters from request parameters, as a dict of strings."""
+    filters = {}
+    for name in ('category', 'tag', 'author'):
+        value = params.get(name, '').strip()
+        if value:
+            filters[name] = value[:150]
+    year = params.get('year', '')
+    if year.isdigit() and 1 <= int(year) < 9999:
+        filters['year'] = str(int(year))
+        # A month only makes sense within a year
+        month = params.get('month', '')
+        if month.isdigit() and 1 <= int(month) <= 12:
+            filters['month'] = str(int(month))
+    return filters
+
+
+def apply_filters(posts, filters, skip=()):
+    """Narrow ``posts`` by ``filters``, ignoring the facets named in ``skip``."""
+    if 'category' in filters and 'category' not in skip:
+        posts = posts.filter(category__slug=filters['category'])
+    if 'tag' in filters and 'tag' not in skip:
+        # EXISTS rather than a join, so grouping by tag isn't narrowed to it
+        posts = posts.filter(Exists(
+            Post.tags.through.objects.filter(post=OuterRef('pk'), tag__slug=filters['tag'])
+        ))
+    if 'author' in filters and 'author' not in skip:
+        posts = posts.filter(author__username=filters['author'])
+    if 'year' in filters and 'year' not in skip:
+        month = int(filters['month']) if 'month' in filters and 'month' not in skip else None
+        # A range on the column itself, so the published_at index applies
+        start, end = month_range(int(filters['year']), month)
+        posts = posts.filter(published_at__gte=start, published_at__lt=end)
+    return posts
+
+
+def _base(query, fuzzy):
+    posts = Post.objects.filter(status=Post.Status.PUBLISHED)
+    if query:
+        ids, _ = search_ids(query, fuzzy=fuzzy)
+        posts = posts.filter(id__in=ids)
+    return posts
+
+
+def _digest(query, filters, fuzzy):
+    parts = [query, str(fuzzy), *(f'{name}={filters[name]}' for name in sorted(filters))]
+    return hashlib.md5('\n'.join(parts).encode()).hexdigest()
+
+
+def facet_counts(query, filters, fuzzy=False):
+    """Counts for every facet value among posts matching ``query`` and ``filters``.
+
+    Returns a dict of ``total`` (posts matching everything) and, per facet,
+    a list of ``{'value', 'label', 'count'}`` dicts, largest first (years
+    and months newest first). ``month`` stays empty until a year is chosen.
+    """
+    query = normalise_query(query)
+
+    def grouped(skip, *fields, **annotations):
+        posts = apply_filters(_base(query, fuzzy), filters, skip=skip)
+        return posts.annotate(**annotations).values(*fields).annotate(count=Count('id'))
+
+    def top(skip, value_field, label_field):
+        # One spare row, as posts without a tag group under NULL
+        rows = grouped(skip, value_field, label_field).order_by('-count', label_field)[:FACET_SIZE + 1]
+        return [
+            {'value': row[value_field], 'label': row[label_field], 'count': row['count']}
+            for row in rows if row[value_field] is not None
+        ][:FACET_SIZE]
+
+    def periods(skip, trunc, value, label_format):
+        rows = grouped(skip, 'period', period=trunc('published_at')).order_by('-period')
+        return [
+            {'value': str(value(row['period'])), 'label': row['period'].strftime(label_format), 'count': row['count']}
+            for row in rows if row['period'] is not None
+        ]
+
+    def load():
+        return {
+            'total': apply_filters(_base(query, fuzzy), filters).count(),
+            'category': top(('category',), 'category__slug', 'category__name'),
+            'tag': top(('tag',), 'tags__slug', 'tags__name'),
+            'author': top(('author',), 'author__username', 'author__username'),
+            'year': periods(('year', 'month'), TruncYear, lambda period: period.year, '%Y'),
+            'month': (
+                periods(('month',), TruncMonth, lambda period: period.month, '%B')
+                if 'year' in filters else []
+            ),
+        }
+
+    return get_or_compute(
+        search_key('facets', _digest(query, filters, fuzzy)),
+        load,
+        settings.SEARCH_CACHE_TIMEOUT,
+    )
+
+
+def filtered_page(query, filters, after=None, fuzzy=False, page_size=12):
+    """One page of posts matching ``query`` and ``filters``.
+
+    ``after`` is the last post id of the previous page. Returns
+    ``(posts, next_cursor, fuzzy_used)``.
+    """
+    posts = apply_filters(Post.objects.filter(status=Post.Status.PUBLISHED), filters)
+    posts = posts.select_related('author', 'category').prefetch_related('tags')
+
+    if not query:
+        if after:
+            posts = posts.filter(id__lt=after)
+        page = list(posts.order_by('-id')[:page_size + 1])
+        next_cursor = page[page_size - 1].id if len(page) > page_size else None
+        return page[:page_size], next_cursor, False
+
+    ids, fuzzy_used = search_ids(query, fuzzy=fuzzy)
+    matching = set(posts.filter(id__in=ids).values_list('id', flat=True))
+    ranked = [post_id for post_id in ids if post_id in matching]
+    start = ranked.index(after) + 1 if after in matching else 0
+    page_ids = ranked[start:start + page_size]
+    found = posts.in_bulk(page_ids)
+    next_cursor = page_ids[-1] if len(ranked) > start + page_size else None
+    return [found[post_id] for post_id in page_ids if post_id in found], next_cursor, fuzzy_used
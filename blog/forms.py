@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
-from .models import Post, Category, Tag, UserProfile
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from .models import Post, Category, Tag, Comment, UserProfile
+from .images import process_avatar_upload
 
 
 class RegistrationForm(UserCreationForm):
@@ -95,12 +98,22 @@ class UserProfileForm(forms.ModelForm):
                 'placeholder': 'City, Country'
             }),
         }
+    
+    def clean_avatar(self):
+        """Validate new uploads and replace them with the processed image."""
+        avatar = self.cleaned_data.get('avatar')
+        if isinstance(avatar, UploadedFile):
+            avatar, self.instance.avatar_hash = process_avatar_upload(avatar)
+        return avatar
 
 
 class PostForm(forms.ModelForm):
+    # The version the edit started from, checked when it is saved
+    base_version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+    
     class Meta:
         model = Post
-        fields = ['title', 'excerpt', 'content', 'category', 'tags', 'status', 'is_featured', 'allow_comments']
+        fields = ['title', 'excerpt', 'content', 'category', 'tags', 'status', 'published_at', 'is_featured', 'allow_comments']
         widgets = {
             'title': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Enter post title'}),
             'excerpt': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Short summary'}),
@@ -108,6 +121,71 @@ class PostForm(forms.ModelForm):
             'category': forms.Select(attrs={'class': 'form-control'}),
             'tags': forms.SelectMultiple(attrs={'class': 'form-control'}),
             'status': forms.Select(attrs={'class': 'form-control'}),
+            'published_at': forms.DateTimeInput(
+                attrs={'class': 'form-control', 'type': 'datetime-local'},
+                format='%Y-%m-%dT%H:%M',
+            ),
             'is_featured': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'allow_comments': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
-        }
\ No newline at end of file
+        }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['base_version'].initial = self.instance.version
+        if self.instance.published_at:
+            # The widget only shows minutes; dropped seconds aren't a change
+            self.initial['published_at'] = self.instance.published_at.replace(second=0, microsecond=0)
+        # Posts are deleted from the delete page, not by picking a status
+        self.fields['status'].choices = [
+            choice for choice in self.fields['status'].choices
+            if choice[0] != Post.Status.DELETED
+        ]
+    
+    def clean(self):
+        """Scheduled posts need a publish date to be released on."""
+        cleaned_data = super().clean()
+        if (
+            cleaned_data.get('status') == Post.Status.SCHEDULED
+            and not cleaned_data.get('published_at')
+        ):
+            self.add_error('published_at', 'Choose when this post should be published.')
+        return cleaned_data
+    
+    def clean_published_at(self):
+        published_at = self.cleaned_data.get('published_at')
+        if published_at is not None and published_at == self.initial.get('published_at'):
+            return self.instance.published_at
+        return published_at
+    
+    def save_changes(self):
+        """Save an edit of an existing post, writing only the fields that changed.
+        
+        Raises ``EditConflict`` if the post was saved by someone else after
+        the form was opened; nothing is written then.
+        """
+        post = self.instance
+        changed = set(self.changed_data) & set(self._meta.fields)
+        if not changed:
+            return post
+        base_version = self.cleaned_data.get('base_version') or self.fields['base_version'].initial
+        with transaction.atomic():
+            post.save_edit([name for name in self._meta.fields if name in changed - {'tags'}], base_version)
+            if 'tags' in changed:
+                post.tags.set(self.cleaned_data['tags'])
+        return post
+
+
+
+class CommentForm(forms.ModelForm):
+    """Form for readers to comment on a post."""
+    class Meta:
+        model = Comment
+        fields = ['content']
+        widgets = {
+            'content': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 3,
+                'placeholder': 'Share your thoughts...'
+            }),
+        }
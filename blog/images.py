@@ -0,0 +1,120 @@
+"""Avatar image pipeline: upload validation and lazily generated thumbnails.
+
+Uploads are size-checked, decoded and re-encoded (dropping EXIF and other
+metadata) on a small bounded worker pool so a burst of large uploads cannot
+tie up every request thread. Thumbnails are rendered on first request and
+stored under content-hashed names, so they never need invalidating.
+"""
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+ALLOWED_FORMATS = {'JPEG', 'PNG', 'WEBP', 'GIF'}
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+}
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.AVATAR_WORKERS,
+    thread_name_prefix='avatar',
+)
+
+
+def process_avatar_upload(uploaded_file):
+    """Validate and normalise an uploaded avatar.
+
+    Returns ``(content_file, content_hash)`` where the file is a
+    metadata-free JPEG named after the hash of its bytes. Raises
+    ``ValidationError`` for oversized, undecodable or unsupported images.
+    """
+    if uploaded_file.size > settings.AVATAR_MAX_UPLOAD_SIZE:
+        limit = settings.AVATAR_MAX_UPLOAD_SIZE // (1024 * 1024)
+        raise ValidationError(f'Profile pictures must be smaller than {limit} MB.')
+
+    data = uploaded_file.read()
+    future = _executor.submit(_normalise, data)
+    try:
+        encoded = future.result(timeout=settings.AVATAR_PROCESSING_TIMEOUT)
+    except TimeoutError:
+        raise ValidationError('This image took too long to process. Please try a smaller one.')
+
+    content_hash = hashlib.sha256(encoded).hexdigest()
+    return ContentFile(encoded, name=f'{content_hash[:32]}.jpg'), content_hash
+
+
+def thumbnail_name(content_hash, size, fmt):
+    return f'avatars/thumbs/{content_hash[:32]}-{size}.{fmt}'
+
+
+def get_thumbnail(profile, size, fmt):
+    """Return the storage name of ``profile``'s avatar at ``size`` pixels.
+
+    The thumbnail is generated and saved the first time it is asked for.
+    """
+    name = thumbnail_name(profile.avatar_hash, size, fmt)
+    if default_storage.exists(name):
+        return name
+
+    with profile.avatar.open('rb') as original:
+        data = original.read()
+    encoded = _executor.submit(_render_thumbnail, data, size, fmt).result(
+        timeout=settings.AVATAR_PROCESSING_TIMEOUT
+    )
+
+    saved = default_storage.save(name, ContentFile(encoded))
+    if saved != name:
+        # Another request rendered it first; keep theirs
+        default_storage.delete(saved)
+    return name
+
+
+def _open_image(data):
+    try:
+        image = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError:
+        # Pillow refuses headers far beyond its own pixel limit outright
+        raise ValidationError('This image is too large. Please upload a smaller one.')
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError('Upload a valid image file (JPEG, PNG, WebP or GIF).')
+
+    if image.format not in ALLOWED_FORMATS:
+        raise ValidationError('Upload a valid image file (JPEG, PNG, WebP or GIF).')
+
+    # Check dimensions from the header before decoding any pixel data
+    width, height = image.size
+    if width * height > settings.AVATAR_MAX_PIXELS:
+        raise ValidationError('This image is too large. Please upload a smaller one.')
+    return image
+
+
+def _normalise(data):
+    image = _open_image(data)
+    try:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+    except (OSError, ValueError):
+        raise ValidationError('This image appears to be corrupted.')
+
+    image.thumbnail((settings.AVATAR_MAX_DIMENSION, settings.AVATAR_MAX_DIMENSION))
+    return _encode(image, 'JPEG')
+
+
+def _render_thumbnail(data, size, fmt):
+    image = Image.open(io.BytesIO(data)).convert('RGB')
+    image = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+    return _encode(image, THUMBNAIL_FORMATS[fmt][0])
+
+
+def _encode(image, image_format):
+    # Saving a fresh image without exif/icc arguments drops all metadata
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=85, optimize=True)
+    return buffer.getvalue()
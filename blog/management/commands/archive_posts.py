@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.archive import DEFAULT_BATCH_SIZE, archive_posts
+
+
+class Command(BaseCommand):
+    help = 'Move archived and long-untouched posts into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--untouched-days',
+            type=int,
+            default=None,
+            help='Also archive published posts not updated for this many days',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of posts moved per transaction',
+        )
+
+    def handle(self, *args, **options):
+        untouched_before = None
+        if options['untouched_days'] is not None:
+            untouched_before = timezone.now() - timedelta(days=options['untouched_days'])
+
+        count = archive_posts(
+            untouched_before=untouched_before,
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'{count} post(s) archived.'))
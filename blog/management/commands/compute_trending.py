@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blog.analytics import rollup_views
+from blog.trending import compute_trending
+from blog.view_events import view_recorder
+
+
+class Command(BaseCommand):
+    help = 'Recompute the trending posts, categories and authors from recent views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=None,
+            help='Length of each trending list (defaults to TRENDING_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        # Score from up-to-date rollups
+        view_recorder.flush()
+        rollup_views()
+        count = compute_trending(size=options['size'])
+        self.stdout.write(self.style.SUCCESS(f'Trending lists rebuilt from {count} post(s).'))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.scheduling import DEFAULT_BATCH_SIZE, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = 'Publish scheduled posts whose publish date has passed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of posts published per UPDATE batch',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and check for due posts every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help='Seconds between checks when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = publish_due_posts(batch_size=options['batch_size'])
+            if count:
+                self.stdout.write(self.style.SUCCESS(f'{count} post(s) published.'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.deletion import CHUNK_SIZE, DEFAULT_BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = 'Remove deleted posts and closed accounts, with their comments, in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of posts purged per round',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Number of comments or tag links deleted per statement',
+        )
+
+    def handle(self, *args, **options):
+        posts, accounts = purge_deleted(
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{posts} post(s) and {accounts} account(s) purged.'
+        ))
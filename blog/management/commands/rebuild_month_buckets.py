@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import invalidate_post_caches
+from blog.date_archive import rebuild_month_buckets
+
+
+class Command(BaseCommand):
+    help = 'Recount the published posts in every archive month from scratch.'
+
+    def handle(self, *args, **options):
+        count = rebuild_month_buckets()
+        invalidate_post_caches(search=False)
+        self.stdout.write(self.style.SUCCESS(f'Archive counts rebuilt for {count} month(s).'))
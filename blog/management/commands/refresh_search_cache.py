@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import precompute_popular, prune_query_stats
+from blog.search_log import query_log
+
+
+class Command(BaseCommand):
+    help = 'Precompute cached search results for the most searched queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=None,
+            help='Number of queries to precompute (defaults to SEARCH_PRECOMPUTE_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        query_log.flush()
+        pruned = prune_query_stats()
+        count = precompute_popular(options['top'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Precomputed results for {count} popular quer{"y" if count == 1 else "ies"}; '
+            f'forgot {pruned} stale one(s).'
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.tags import rebuild_tag_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild tag post counts and co-occurrence data from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of tags refreshed per batch',
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_tag_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Statistics refreshed for {count} tag(s).'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.analytics import rollup_views
+from blog.view_events import view_recorder
+
+
+class Command(BaseCommand):
+    help = 'Fold new view events from the analytics log into hourly and daily rollups.'
+
+    def handle(self, *args, **options):
+        view_recorder.flush()
+        count = rollup_views()
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {count} view(s).'))
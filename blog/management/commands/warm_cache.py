@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from blog.cache import WARMUP_HEADER
+from blog.date_archive import recent_archive_months
+from blog.models import Category, Post, Tag
+
+
+class Command(BaseCommand):
+    help = 'Render the hot pages into the page cache after a deploy or mass publish.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-posts',
+            type=int,
+            default=100,
+            help='Number of most-viewed posts to warm',
+        )
+        parser.add_argument(
+            '--top-tags',
+            type=int,
+            default=50,
+            help='Number of largest tag pages to warm',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Number of pages rendered in parallel',
+        )
+        parser.add_argument(
+            '--host',
+            default=None,
+            help='Host header to send (defaults to the first ALLOWED_HOSTS entry)',
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(caches['default'], (LocMemCache, DummyCache)):
+            # Pages would be rendered into this process's cache and thrown away
+            raise CommandError(
+                'The default cache is local to this process, so warming it cannot help the web '
+                'servers; set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis.'
+            )
+
+        urls = self.hot_urls(options['top_posts'], options['top_tags'])
+        host = options['host'] or next(
+            (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'),
+            'localhost',
+        )
+
+        local = threading.local()
+
+        def render(url):
+            # Test clients are not thread-safe; give each worker its own
+            if not hasattr(local, 'client'):
+                local.client = Client(
+                    HTTP_HOST=host,
+                    headers={WARMUP_HEADER: '1'},
+                    raise_request_exception=False,
+                )
+            started = time.perf_counter()
+            try:
+                status = local.client.get(url).status_code
+            finally:
+                connections.close_all()
+            return url, status, time.perf_counter() - started
+
+        started = time.perf_counter()
+        failures = 0
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            futures = [executor.submit(render, url) for url in urls]
+            for done, future in enumerate(as_completed(futures), start=1):
+                url, status, elapsed = future.result()
+                if status != 200:
+                    failures += 1
+                self.stdout.write(f'[{done}/{len(urls)}] {status} {elapsed * 1000:7.1f} ms  {url}')
+
+        total = time.perf_counter() - started
+        summary = f'Warmed {len(urls) - failures}/{len(urls)} page(s) in {total:.1f}s.'
+        if failures:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def hot_urls(self, top_posts, top_tags):
+        """Home, listings, most-viewed posts, every category and author page, top tags, recent months."""
+        urls = [
+            reverse('blog:home'),
+            reverse('blog:about'),
+            reverse('blog:posts'),
+            reverse('blog:featured_posts'),
+            reverse('blog:tag_cloud'),
+            reverse('blog:trending'),
+            reverse('blog:author_directory'),
+            reverse('blog:archive_index'),
+        ]
+
+        published = Post.objects.filter(status=Post.Status.PUBLISHED)
+        urls += [
+            reverse('blog:post_detail', args=[slug])
+            for slug in published.order_by('-views_count').values_list('slug', flat=True)[:top_posts]
+        ]
+        urls += [
+            reverse('blog:category_posts', args=[name.lower()])
+            for name in Category.objects.values_list('name', flat=True)
+        ]
+        urls += [
+            reverse('blog:author_posts', args=[username.lower()])
+            for username in User.objects.filter(posts__status=Post.Status.PUBLISHED)
+            .distinct().values_list('username', flat=True)
+        ]
+        urls += [
+            reverse('blog:tag_posts', args=[slug])
+            for slug in Tag.objects.filter(published_post_count__gt=0)
+            .order_by('-published_post_count').values_list('slug', flat=True)[:top_tags]
+        ]
+        urls += [
+            reverse('blog:archive_month', args=[month.year, month.month])
+            for month, _ in recent_archive_months()
+        ]
+        return urls
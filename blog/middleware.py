@@ -0,0 +1,32 @@
+import math
+
+from django.http import HttpResponse
+
+from .ratelimit import check_rate_limit
+
+
+class RateLimitMiddleware:
+    """Reject over-limit requests with a 429 before the view touches the database."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match is None:
+            return None
+
+        retry_after = check_rate_limit(request, match.view_name)
+        if retry_after is None:
+            return None
+
+        response = HttpResponse(
+            'Too many requests. Please slow down and try again shortly.',
+            status=429,
+            content_type='text/plain; charset=utf-8',
+        )
+        response['Retry-After'] = str(math.ceil(retry_after))
+        return response
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_archivedpost_archivedcomment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='published_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of published posts with this tag (maintained automatically)'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-published_post_count'], name='blog_tag_publish_459843_idx'),
+        ),
+        migrations.AddField(
+            model_name='tagcooccurrence',
+            name='other',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.tag'),
+        ),
+        migrations.AddField(
+            model_name='tagcooccurrence',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='blog.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='tagcooccurrence',
+            index=models.Index(fields=['tag', '-count'], name='blog_tagcoo_tag_id_b06c55_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tagcooccurrence',
+            constraint=models.UniqueConstraint(fields=('tag', 'other'), name='unique_tag_cooccurrence'),
+        ),
+        # Tag pages walk the post/tag link table by tag; the default unique
+        # index is (post_id, tag_id), so add the reverse composite index.
+        migrations.RunSQL(
+            'CREATE INDEX blog_post_tags_tag_post_idx ON blog_post_tags (tag_id, post_id);',
+            reverse_sql='DROP INDEX blog_post_tags_tag_post_idx;',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_comment_pending_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='avatar_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the processed avatar, used to name its thumbnails', max_length=64),
+        ),
+    ]
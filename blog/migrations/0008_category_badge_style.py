@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+# Badge styles previously hard-coded in posts.html / featured_posts.html
+DEFAULT_BADGES = {
+    'Technology': ('linear-gradient(90deg, #007bff, #00d4ff)', 'white'),
+    'Design': ('linear-gradient(90deg, #f8f9fa, #dee2e6)', 'dark'),
+    'Travel': ('linear-gradient(90deg, #28a745, #6fdc8c)', 'white'),
+    'Education': ('linear-gradient(90deg, #ffc107, #ffe083)', 'dark'),
+    'Photography': ('linear-gradient(90deg, #e83e8c, #ff6f91)', 'white'),
+}
+
+
+def set_default_badges(apps, schema_editor):
+    Category = apps.get_model('blog', 'Category')
+    for name, (background, text_color) in DEFAULT_BADGES.items():
+        Category.objects.filter(name=name).update(
+            badge_background=background,
+            badge_text_color=text_color,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_userprofile_avatar_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='badge_background',
+            field=models.CharField(blank=True, help_text='CSS background for the category badge, e.g. linear-gradient(90deg, #007bff, #00d4ff)', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='badge_text_color',
+            field=models.CharField(choices=[('white', 'Light'), ('dark', 'Dark')], default='white', help_text='Text colour used on the category badge', max_length=5),
+        ),
+        migrations.RunPython(set_default_badges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_category_badge_style'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Post'), ('category', 'Category'), ('author', 'Author')], help_text='What the ranked object is', max_length=10)),
+                ('rank', models.PositiveIntegerField(help_text='Position in the list, starting at 1')),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the post, category or user')),
+                ('score', models.FloatField(help_text='Time-decayed view score')),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Trending Entries',
+                'ordering': ['kind', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'rank'), name='unique_trending_rank')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(help_text='Start of the hour the views fall in')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='blog.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='blog_postvi_hour_2cb678_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'hour'), name='unique_post_view_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:53
+
+from django.db import migrations, models
+
+
+def copy_view_buckets(apps, schema_editor):
+    """Keep the hourly post views recorded so far as hourly rollups."""
+    PostViewBucket = apps.get_model('blog', 'PostViewBucket')
+    ViewRollup = apps.get_model('blog', 'ViewRollup')
+    rollups = (
+        ViewRollup(period='hour', dimension='post', object_id=post_id, start=hour, views=views)
+        for post_id, hour, views in PostViewBucket.objects.values_list('post_id', 'hour', 'views').iterator()
+    )
+    ViewRollup.objects.bulk_create(rollups, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_view_buckets_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('log_name', models.CharField(help_text='File name of the event log', max_length=100, unique=True)),
+                ('offset', models.PositiveBigIntegerField(default=0, help_text='Bytes of the file already rolled up')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ViewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], help_text='Length of the time bucket', max_length=4)),
+                ('dimension', models.CharField(choices=[('post', 'Post'), ('author', 'Author'), ('category', 'Category')], help_text='What the views are grouped by', max_length=10)),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the post, author or category')),
+                ('start', models.DateTimeField(help_text='Start of the hour or day')),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'start'], name='blog_viewro_period_b8e4df_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'dimension', 'object_id', 'start'), name='unique_view_rollup')],
+            },
+        ),
+        migrations.RunPython(copy_view_buckets, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='PostViewBucket',
+        ),
+    ]
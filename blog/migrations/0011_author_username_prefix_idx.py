@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0010_view_rollups'),
+    ]
+
+    operations = [
+        # Author directory and autocomplete filter with username__istartswith,
+        # which compiles to UPPER(username::text) LIKE 'AB%'.
+        migrations.RunSQL(
+            'CREATE INDEX blog_auth_user_username_upper_idx '
+            'ON auth_user (UPPER(username::text) text_pattern_ops);',
+            reverse_sql='DROP INDEX blog_auth_user_username_upper_idx;',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:02
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_author_username_prefix_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Full-text search; the expression must match the SearchVector built
+        # in blog.search.full_text_search for the planner to use it
+        migrations.RunSQL(
+            "CREATE INDEX blog_post_search_idx ON blog_post USING gin ("
+            "to_tsvector('english'::regconfig, "
+            "COALESCE(title, '') || ' ' || COALESCE(excerpt, '')));",
+            reverse_sql='DROP INDEX blog_post_search_idx;',
+        ),
+        # Trigram indexes for the fuzzy fallback on titles and tag names
+        migrations.RunSQL(
+            'CREATE INDEX blog_post_title_trgm_idx ON blog_post USING gin (title gin_trgm_ops);',
+            reverse_sql='DROP INDEX blog_post_title_trgm_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX blog_tag_name_trgm_idx ON blog_tag USING gin (name gin_trgm_ops);',
+            reverse_sql='DROP INDEX blog_tag_name_trgm_idx;',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(help_text='Normalised search query', max_length=200, unique=True)),
+                ('count', models.PositiveIntegerField(default=0, help_text='Number of times the query was searched')),
+                ('last_searched_at', models.DateTimeField(db_index=True, help_text='When the query was last searched')),
+            ],
+            options={
+                'verbose_name': 'Search Query',
+                'verbose_name_plural': 'Search Queries',
+                'ordering': ['-count'],
+            },
+        ),
+    ]
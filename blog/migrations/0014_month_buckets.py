@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:05
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+
+def fill_month_buckets(apps, schema_editor):
+    """Count the posts published so far into their months."""
+    Post = apps.get_model('blog', 'Post')
+    MonthBucket = apps.get_model('blog', 'MonthBucket')
+    months = (
+        Post.objects.filter(status='published', published_at__isnull=False)
+        .annotate(month=TruncMonth('published_at')).values('month')
+        .annotate(total=Count('id')).order_by()
+    )
+    MonthBucket.objects.bulk_create(
+        MonthBucket(month=row['month'].date(), post_count=row['total']) for row in months
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_search_query_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month', unique=True)),
+                ('post_count', models.PositiveIntegerField(default=0, help_text='Published posts in the month (maintained automatically)')),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.RunPython(fill_month_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_month_buckets'),
+    ]
+
+    operations = [
+        # Admin comment search in performance mode; the expression must match
+        # blog.search.comment_search_vector for the planner to use it
+        migrations.RunSQL(
+            "CREATE INDEX blog_comment_search_idx ON blog_comment USING gin ("
+            "to_tsvector('english'::regconfig, COALESCE(content, '')));",
+            reverse_sql='DROP INDEX blog_comment_search_idx;',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_comment_search_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the account was closed; purge_deleted removes it and its content', null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivedpost',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('published', 'Published'), ('scheduled', 'Scheduled'), ('archived', 'Archived'), ('deleted', 'Deleted')], help_text='Status of the post when it was archived', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('published', 'Published'), ('scheduled', 'Scheduled'), ('archived', 'Archived'), ('deleted', 'Deleted')], default='draft', help_text='Publication status', max_length=10),
+        ),
+    ]
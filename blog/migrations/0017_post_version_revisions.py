@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every save; edits of an older version are rejected'),
+        ),
+        migrations.CreateModel(
+            name='PostRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(help_text='Position in the history of the post, starting at 1')),
+                ('delta', models.JSONField(help_text='Line operations turning the previous revision into this one')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='blog.post')),
+            ],
+            options={
+                'ordering': ['post', 'number'],
+                'constraints': [models.UniqueConstraint(fields=('post', 'number'), name='unique_post_revision')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def compress_revisions(apps, schema_editor):
+    """Compress the JSON deltas; revision 1 becomes a full-text snapshot."""
+    PostRevision = apps.get_model('blog', 'PostRevision')
+    for revision in PostRevision.objects.order_by('pk').iterator(chunk_size=500):
+        if revision.number == 1:
+            # Revision 1 is a delta against an empty text, i.e. only insertions
+            text = ''.join(op for op in revision.delta if isinstance(op, str))
+            revision.is_snapshot = True
+            revision.data = zlib.compress(text.encode())
+        else:
+            revision.data = zlib.compress(json.dumps(revision.delta, separators=(',', ':')).encode())
+        revision.save(update_fields=['is_snapshot', 'data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_version_revisions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postrevision',
+            name='is_snapshot',
+            field=models.BooleanField(default=False, help_text='Whether data holds the full text rather than a delta'),
+        ),
+        migrations.AddField(
+            model_name='postrevision',
+            name='data',
+            field=models.BinaryField(default=b'', help_text='zlib-compressed full text or line delta'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(compress_revisions, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='postrevision',
+            name='delta',
+        ),
+    ]
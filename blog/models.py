@@ -1,4 +1,5 @@
 from django.db import models
+from django.urls import reverse
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 from django.utils import timezone
@@ -6,6 +7,11 @@ from django.utils import timezone
 
 class Category(models.Model):
     """Blog post categories for organization."""
+    
+    class BadgeText(models.TextChoices):
+        LIGHT = 'white', 'Light'
+        DARK = 'dark', 'Dark'
+    
     name = models.CharField(
         max_length=100,
         unique=True,
@@ -20,6 +26,17 @@ class Category(models.Model):
         blank=True,
         help_text='Optional category description'
     )
+    badge_background = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text='CSS background for the category badge, e.g. linear-gradient(90deg, #007bff, #00d4ff)'
+    )
+    badge_text_color = models.CharField(
+        max_length=5,
+        choices=BadgeText.choices,
+        default=BadgeText.LIGHT,
+        help_text='Text colour used on the category badge'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -48,10 +65,18 @@ class Tag(models.Model):
         unique=True,
         help_text='URL-friendly version of the name'
     )
+    published_post_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of published posts with this tag (maintained automatically)'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['-published_post_count']),
+        ]
     
     def __str__(self):
         return self.name
@@ -62,13 +87,49 @@ class Tag(models.Model):
         super().save(*args, **kwargs)
 
 
+class TagCooccurrence(models.Model):
+    """How many published posts carry both ``tag`` and ``other``.
+
+    Rows are stored in both directions so related tags for any tag are a
+    single index range scan.
+    """
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='cooccurrences'
+    )
+    other = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'other'], name='unique_tag_cooccurrence'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', '-count']),
+        ]
+    
+    def __str__(self):
+        return f'{self.tag} + {self.other} ({self.count})'
+
+
+class EditConflict(Exception):
+    """The post was saved by someone else after the edit was started."""
+
+
 class Post(models.Model):
     """Main blog post model."""
     
     class Status(models.TextChoices):
         DRAFT = 'draft', 'Draft'
         PUBLISHED = 'published', 'Published'
+        SCHEDULED = 'scheduled', 'Scheduled'
         ARCHIVED = 'archived', 'Archived'
+        DELETED = 'deleted', 'Deleted'
     
     # Basic fields
     title = models.CharField(
@@ -128,6 +189,11 @@ class Post(models.Model):
         default=0,
         help_text='Number of views'
     )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text='Incremented on every save; edits of an older version are rejected'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(
@@ -141,6 +207,7 @@ class Post(models.Model):
         indexes = [
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['-published_at']),
+            models.Index(fields=['status', 'published_at']),
         ]
     
     def __str__(self):
@@ -155,7 +222,88 @@ class Post(models.Model):
         if self.status == self.Status.PUBLISHED and not self.published_at:
             self.published_at = timezone.now()
         
+        # A publish date in the future schedules the post instead
+        if (
+            self.status == self.Status.PUBLISHED
+            and self.published_at > timezone.now()
+        ):
+            self.status = self.Status.SCHEDULED
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'status', 'published_at'} & set(update_fields):
+            # Saving either can change the other (see above)
+            kwargs['update_fields'] = {*update_fields, 'status', 'published_at'}
+        elif update_fields is None and not self._state.adding:
+            # Whole-row saves (the admin, scripts) aren't checked but still count
+            self.version += 1
+        
         super().save(*args, **kwargs)
+    
+    def save_edit(self, fields, base_version):
+        """Write only ``fields``, and only if the stored post is still at ``base_version``.
+        
+        The version check is part of the ``UPDATE``'s ``WHERE`` clause, so of
+        two edits started from the same version exactly one is saved; the
+        other raises ``EditConflict`` and writes nothing.
+        """
+        self.version = base_version + 1
+        self._expected_version = base_version
+        try:
+            self.save(update_fields=[*fields, 'version', 'updated_at'])
+        finally:
+            del self._expected_version
+    
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected_version = getattr(self, '_expected_version', None)
+        if expected_version is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        updated = super()._do_update(
+            base_qs.filter(version=expected_version),
+            using, pk_val, values, update_fields, forced_update,
+        )
+        if not updated:
+            raise EditConflict(f'Post {pk_val} is no longer at version {expected_version}.')
+        return updated
+
+
+class PostRevision(models.Model):
+    """One saved version of a post's content.
+
+    Most revisions are a compressed delta against the one before; every
+    so often (and always for revision 1) the full text is stored instead,
+    so rebuilding any revision starts from a nearby snapshot. See
+    ``blog.revisions`` for the format.
+    
+    Revisions are keyed by post id without a database constraint, so they
+    stay with a post when it moves to ``ArchivedPost`` (which keeps the
+    id); they are deleted once the post is gone from both tables.
+    """
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='revisions'
+    )
+    number = models.PositiveIntegerField(
+        help_text='Position in the history of the post, starting at 1'
+    )
+    is_snapshot = models.BooleanField(
+        default=False,
+        help_text='Whether data holds the full text rather than a delta'
+    )
+    data = models.BinaryField(
+        help_text='zlib-compressed full text or line delta'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['post', 'number']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'number'], name='unique_post_revision'),
+        ]
+    
+    def __str__(self):
+        return f'Revision {self.number} of post {self.post_id}'
 
 
 class Comment(models.Model):
@@ -184,6 +332,12 @@ class Comment(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['post', '-created_at']),
+            # Moderation queue: only pending comments are indexed
+            models.Index(
+                fields=['id'],
+                condition=models.Q(is_approved=False),
+                name='blog_comment_pending_idx',
+            ),
         ]
     
     def __str__(self):
@@ -207,6 +361,12 @@ class UserProfile(models.Model):
         null=True,
         help_text='Profile picture'
     )
+    avatar_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text='SHA-256 of the processed avatar, used to name its thumbnails'
+    )
     website = models.URLField(
         blank=True,
         help_text='Personal website URL'
@@ -216,6 +376,12 @@ class UserProfile(models.Model):
         blank=True,
         help_text='User location'
     )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='When the account was closed; purge_deleted removes it and its content'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -224,4 +390,236 @@ class UserProfile(models.Model):
         verbose_name_plural = 'User Profiles'
     
     def __str__(self):
-        return f'{self.user.username} Profile'
\ No newline at end of file
+        return f'{self.user.username} Profile'
+    
+    def avatar_url(self, size=96):
+        """URL of a square thumbnail of the avatar, or '' when there is none."""
+        if not self.avatar or not self.avatar_hash:
+            return ''
+        url = reverse('blog:avatar', args=[self.user.username, size])
+        return f'{url}?v={self.avatar_hash[:12]}'
+
+class ArchivedPost(models.Model):
+    """Cold-storage copy of a post moved out of the hot ``Post`` table.
+
+    Rows keep the id of the post they were archived from, and the date
+    fields are copied verbatim rather than regenerated.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200)
+    excerpt = models.TextField(blank=True)
+    content = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        choices=Post.Status.choices,
+        help_text='Status of the post when it was archived'
+    )
+    is_featured = models.BooleanField(default=False)
+    allow_comments = models.BooleanField(default=True)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts'
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_posts'
+    )
+    tags = models.ManyToManyField(
+        Tag,
+        blank=True,
+        related_name='archived_posts'
+    )
+    views_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    published_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """Cold-storage copy of a comment whose post has been archived."""
+    id = models.BigIntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments'
+    )
+    content = models.TextField()
+    is_approved = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f'Archived comment {self.pk} on {self.post.title}'
+
+
+class ViewRollup(models.Model):
+    """Post views aggregated per hour or day for a post, author or category.
+
+    Built from the view event log by ``blog.analytics.rollup_views``;
+    ``object_id`` is the primary key of the post, user or category.
+    """
+    
+    class Period(models.TextChoices):
+        HOUR = 'hour', 'Hour'
+        DAY = 'day', 'Day'
+    
+    class Dimension(models.TextChoices):
+        POST = 'post', 'Post'
+        AUTHOR = 'author', 'Author'
+        CATEGORY = 'category', 'Category'
+    
+    period = models.CharField(
+        max_length=4,
+        choices=Period.choices,
+        help_text='Length of the time bucket'
+    )
+    dimension = models.CharField(
+        max_length=10,
+        choices=Dimension.choices,
+        help_text='What the views are grouped by'
+    )
+    object_id = models.BigIntegerField(
+        help_text='Primary key of the post, author or category'
+    )
+    start = models.DateTimeField(
+        help_text='Start of the hour or day'
+    )
+    views = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['period', 'dimension', 'object_id', 'start'],
+                name='unique_view_rollup',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'start']),
+        ]
+    
+    def __str__(self):
+        return f'{self.dimension} {self.object_id} @ {self.start:%Y-%m-%d %H:00} ({self.period}): {self.views}'
+
+
+class AnalyticsCheckpoint(models.Model):
+    """How far into a view event log file the rollups have read."""
+    log_name = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text='File name of the event log'
+    )
+    offset = models.PositiveBigIntegerField(
+        default=0,
+        help_text='Bytes of the file already rolled up'
+    )
+    
+    def __str__(self):
+        return f'{self.log_name}: {self.offset}'
+
+
+class TrendingEntry(models.Model):
+    """One row of a precomputed trending list, rebuilt by ``compute_trending``."""
+    
+    class Kind(models.TextChoices):
+        POST = 'post', 'Post'
+        CATEGORY = 'category', 'Category'
+        AUTHOR = 'author', 'Author'
+    
+    kind = models.CharField(
+        max_length=10,
+        choices=Kind.choices,
+        help_text='What the ranked object is'
+    )
+    rank = models.PositiveIntegerField(
+        help_text='Position in the list, starting at 1'
+    )
+    object_id = models.BigIntegerField(
+        help_text='Primary key of the post, category or user'
+    )
+    score = models.FloatField(
+        help_text='Time-decayed view score'
+    )
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['kind', 'rank']
+        verbose_name_plural = 'Trending Entries'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'rank'],
+                name='unique_trending_rank',
+            ),
+        ]
+    
+    def __str__(self):
+        return f'{self.get_kind_display()} #{self.rank}'
+
+
+class SearchQueryStat(models.Model):
+    """How often a normalised search query has been run, for precomputing results."""
+    query = models.CharField(
+        max_length=200,
+        unique=True,
+        help_text='Normalised search query'
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of times the query was searched'
+    )
+    last_searched_at = models.DateTimeField(
+        db_index=True,
+        help_text='When the query was last searched'
+    )
+    
+    class Meta:
+        ordering = ['-count']
+        verbose_name = 'Search Query'
+        verbose_name_plural = 'Search Queries'
+    
+    def __str__(self):
+        return f'{self.query} ({self.count})'
+
+
+class MonthBucket(models.Model):
+    """Number of published posts in one calendar month, for the date archive.
+
+    Kept up to date as posts are published, unpublished and deleted (see
+    ``blog.date_archive``); months are in the site time zone.
+    """
+    month = models.DateField(
+        unique=True,
+        help_text='First day of the month'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Published posts in the month (maintained automatically)'
+    )
+    
+    class Meta:
+        ordering = ['-month']
+    
+    def __str__(self):
+        return f'{self.month:%B %Y}: {self.post_count}'
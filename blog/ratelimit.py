@@ -0,0 +1,133 @@
+"""Token-bucket rate limiting for write and search endpoints.
+
+Limits are configured per URL name in ``settings.RATELIMITS`` and enforced
+by ``blog.middleware.RateLimitMiddleware`` before the view runs. Bucket
+state lives in the store named by ``settings.RATELIMIT_STORE``:
+``CacheStore`` shares counters between processes through Django's cache,
+``MemoryStore`` keeps them in the current process (handy for tests and
+single-process development servers).
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Turn ``'5/m'`` into ``(5, 60)``: capacity and period in seconds."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0].lower()]
+
+
+def _take_token(state, capacity, period, now):
+    """Refill ``state`` for the time elapsed and try to take one token.
+
+    Returns ``(allowed, retry_after, new_state)``.
+    """
+    refill_rate = capacity / period
+    tokens, updated_at = state if state else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+    if tokens >= 1:
+        return True, 0, (tokens - 1, now)
+    return False, (1 - tokens) / refill_rate, (tokens, now)
+
+
+class MemoryStore:
+    """Per-process bucket store."""
+
+    max_entries = 10000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, period):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._buckets) >= self.max_entries:
+                self._prune(now, period)
+            allowed, retry_after, self._buckets[key] = _take_token(
+                self._buckets.get(key), capacity, period, now
+            )
+        return allowed, retry_after
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def _prune(self, now, period):
+        # Buckets untouched for a full period have refilled; forget them
+        self._buckets = {
+            key: state for key, state in self._buckets.items()
+            if now - state[1] < period
+        }
+
+
+class CacheStore:
+    """Bucket store shared through the default cache backend.
+
+    Reads and writes are not atomic, so concurrent requests may
+    occasionally slip one extra token through; that is acceptable for
+    abuse throttling and avoids a lock round trip per request.
+    """
+
+    key_prefix = 'blog:ratelimit:'
+
+    def consume(self, key, capacity, period):
+        cache_key = self.key_prefix + key
+        allowed, retry_after, state = _take_token(
+            cache.get(cache_key), capacity, period, time.time()
+        )
+        cache.set(cache_key, state, timeout=period)
+        return allowed, retry_after
+
+
+_store = None
+
+
+def get_store():
+    """Return the configured bucket store, created on first use."""
+    global _store
+    if _store is None:
+        _store = import_string(settings.RATELIMIT_STORE)()
+    return _store
+
+
+def client_identity(request, key='ip'):
+    """Identify the client for a rule keyed by ``'ip'`` or ``'user'``.
+
+    User ids are read straight from the session so no ``User`` row is
+    loaded; anonymous clients fall back to their IP address.
+    """
+    if key == 'user':
+        user_id = request.session.get(SESSION_KEY)
+        if user_id is not None:
+            return f'user:{user_id}'
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def check_rate_limit(request, view_name):
+    """Apply the rule configured for ``view_name``.
+
+    Returns ``None`` when the request may proceed, otherwise the number of
+    seconds the client should wait.
+    """
+    rule = settings.RATELIMITS.get(view_name)
+    if rule is None:
+        return None
+
+    methods = rule.get('methods')
+    if methods and request.method not in methods:
+        return None
+
+    capacity, period = parse_rate(rule['rate'])
+    identity = client_identity(request, rule.get('key', 'ip'))
+    allowed, retry_after = get_store().consume(f'{view_name}:{identity}', capacity, period)
+    return None if allowed else retry_after
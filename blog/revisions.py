@@ -0,0 +1,128 @@
+"""Revision history of post content: compressed deltas and periodic snapshots.
+
+Every save that changes a post's ``content`` adds a ``PostRevision`` (see
+``blog.signals``). Most revisions store only a line delta against the
+previous revision, a list of operations applied in order to the previous
+text split into lines:
+
+* ``[start, end]`` copies lines ``start:end`` of the previous text;
+* a string is new text inserted as is.
+
+Revision 1, every ``REVISION_SNAPSHOT_INTERVAL``-th revision after it and
+any revision whose delta would be bigger than the text itself store the
+full text instead. Both kinds are JSON or UTF-8 compressed with zlib, so
+history grows with the size of the edits rather than of the post.
+
+Rebuilding a revision starts from the nearest snapshot at or before it
+and applies at most ``REVISION_SNAPSHOT_INTERVAL - 1`` deltas, read
+``REVISION_FETCH_SIZE`` rows at a time; only the text being rebuilt and
+one batch of compressed rows are ever held in memory.
+"""
+import json
+import zlib
+from difflib import SequenceMatcher
+
+from django.conf import settings
+
+from .models import PostRevision
+
+
+def make_delta(old, new):
+    """Operations turning the text ``old`` into ``new``."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta = []
+    matcher = SequenceMatcher(None, old_lines, new_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif tag in ('replace', 'insert'):
+            delta.append(''.join(new_lines[j1:j2]))
+    return delta
+
+
+def apply_delta(old, delta):
+    """The text produced by applying ``delta`` to ``old``."""
+    old_lines = old.splitlines(keepends=True)
+    return ''.join(
+        op if isinstance(op, str) else ''.join(old_lines[op[0]:op[1]])
+        for op in delta
+    )
+
+
+def _snapshot(post, number, content):
+    return PostRevision(
+        post=post,
+        number=number,
+        is_snapshot=True,
+        data=zlib.compress(content.encode()),
+    )
+
+
+def _revision(post, number, previous_content, content):
+    """A delta revision, or a snapshot when one is due or smaller."""
+    if (number - 1) % settings.REVISION_SNAPSHOT_INTERVAL == 0:
+        return _snapshot(post, number, content)
+    delta = json.dumps(make_delta(previous_content, content), separators=(',', ':')).encode()
+    if len(delta) >= len(content.encode()):
+        # Mostly rewritten; the text itself is the shorter record
+        return _snapshot(post, number, content)
+    return PostRevision(post=post, number=number, data=zlib.compress(delta))
+
+
+def record_revision(post, previous_content):
+    """Store ``post.content`` as a new revision after ``previous_content``."""
+    last = (
+        PostRevision.objects.filter(post=post)
+        .order_by('-number')
+        .values_list('number', flat=True)
+        .first()
+    )
+    revisions = []
+    if last is None:
+        last = 0
+        if previous_content:
+            # The post predates revision history; keep the text it started from
+            revisions.append(_snapshot(post, 1, previous_content))
+            last = 1
+    revisions.append(_revision(post, last + 1, previous_content, post.content))
+    PostRevision.objects.bulk_create(revisions)
+
+
+def iter_revisions(post_id, first=1, last=None):
+    """Yield ``(number, content)`` for revisions ``first`` to ``last`` of a post, in order.
+
+    Revisions are rebuilt one after another from the nearest snapshot at
+    or before ``first``, so walking a long history holds a single text at
+    a time. Stops early at a gap in the history.
+    """
+    start = (
+        PostRevision.objects.filter(post_id=post_id, number__lte=first, is_snapshot=True)
+        .order_by('-number')
+        .values_list('number', flat=True)
+        .first()
+    )
+    if start is None:
+        return
+    rows = PostRevision.objects.filter(post_id=post_id, number__gte=start).order_by('number')
+    if last is not None:
+        rows = rows.filter(number__lte=last)
+
+    content, expected = '', start
+    for number, is_snapshot, data in rows.values_list('number', 'is_snapshot', 'data').iterator(
+        chunk_size=settings.REVISION_FETCH_SIZE
+    ):
+        if number != expected:
+            return
+        data = zlib.decompress(data)
+        content = data.decode() if is_snapshot else apply_delta(content, json.loads(data))
+        if number >= first:
+            yield number, content
+        expected += 1
+
+
+def revision_content(post_id, number):
+    """The content of revision ``number`` of a post, or ``None`` if there is none."""
+    for _, content in iter_revisions(post_id, number, number):
+        return content
+    return None
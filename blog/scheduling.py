@@ -0,0 +1,57 @@
+"""Scheduled publishing of posts with a future ``published_at``."""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .authors import invalidate_author_stats
+from .cache import invalidate_post_caches
+from .date_archive import adjust_month_buckets, months_for_posts
+from .models import Post
+from .tags import refresh_tag_stats, tag_ids_for_posts
+
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def publish_due_posts(now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Publish every scheduled post whose publish date has passed.
+
+    Posts are flipped in bulk ``UPDATE`` batches driven by the
+    ``(status, published_at)`` index, and caches are invalidated once per
+    batch rather than once per post, together with the stats of the
+    batch's tags and archive months. Returns the number of posts published.
+    """
+    now = now or timezone.now()
+    published = 0
+
+    while True:
+        with transaction.atomic():
+            post_ids = list(
+                Post.objects.filter(
+                    status=Post.Status.SCHEDULED,
+                    published_at__lte=now,
+                )
+                .select_for_update(skip_locked=True)
+                .order_by('published_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not post_ids:
+                break
+
+            updated = Post.objects.filter(
+                id__in=post_ids,
+                status=Post.Status.SCHEDULED,
+            ).update(status=Post.Status.PUBLISHED, version=F('version') + 1)
+
+        published += updated
+        invalidate_post_caches()
+        invalidate_author_stats(
+            Post.objects.filter(id__in=post_ids).values_list('author_id', flat=True)
+        )
+        refresh_tag_stats(tag_ids_for_posts(post_ids))
+        adjust_month_buckets(months_for_posts(post_ids))
+
+        if len(post_ids) < batch_size:
+            break
+
+    return published
@@ -0,0 +1,188 @@
+"""Post search: PostgreSQL full-text search with a trigram fallback.
+
+Queries are matched against the title and excerpt with full-text search
+(``websearch_to_tsquery``, so quotes and ``-word`` work) plus an exact
+category name match. When that finds fewer than ``SEARCH_FUZZY_THRESHOLD``
+posts, or fuzzy mode is asked for, posts whose title words or tag names
+are close to the query by ``pg_trgm`` word similarity are appended, so
+"djnago" still finds Django posts. Both stages are served by GIN indexes
+created in migration 0012.
+
+Ranked result ids, the fuzzy matches and each rendered page of results are
+cached per normalised query under the search version (see ``blog.cache``),
+which only moves when a change could alter results: a published post's
+title, excerpt, status, category or tags, or a category or tag rename.
+The most searched queries, counted by ``blog.search_log``, are recomputed
+ahead of time by the ``refresh_search_cache`` command.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import get_or_compute, search_key, store
+from .models import Category, Post, SearchQueryStat, Tag
+
+
+SEARCH_CONFIG = 'english'
+
+
+def normalise_query(query):
+    return ' '.join(query.casefold().split())
+
+
+def _digest(query, *parts):
+    return hashlib.md5(':'.join([query, *map(str, parts)]).encode()).hexdigest()
+
+
+def _published():
+    return Post.objects.filter(status=Post.Status.PUBLISHED)
+
+
+def post_search_vector():
+    # Must match the expression of the blog_post_search_idx index
+    return SearchVector('title', 'excerpt', config=SEARCH_CONFIG)
+
+
+def comment_search_vector():
+    # Must match the expression of the blog_comment_search_idx index
+    return SearchVector('content', config=SEARCH_CONFIG)
+
+
+def parse_search_query(query):
+    return SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def full_text_search(query):
+    """Published posts matching ``query``, best matches first."""
+    vector = post_search_vector()
+    search_query = parse_search_query(query)
+    matches = Q(search=search_query)
+    # Literal ids, not a subquery: PostgreSQL can only combine the GIN and
+    # category indexes (a BitmapOr) when both sides are plain conditions
+    category_ids = list(Category.objects.filter(name__iexact=query).values_list('id', flat=True))
+    if category_ids:
+        matches |= Q(category_id__in=category_ids)
+    return _published().annotate(
+        search=vector,
+        rank=SearchRank(vector, search_query),
+    ).filter(matches).order_by('-rank', '-published_at')
+
+
+def fuzzy_post_ids(query, limit=None):
+    """Ids of published posts whose title words or tags resemble ``query``.
+
+    Returns at most ``limit`` ids, most similar first.
+    """
+    limit = limit or settings.SEARCH_FUZZY_LIMIT
+    query = normalise_query(query)
+
+    def load():
+        scores = dict(
+            _published().filter(title__trigram_word_similar=query).annotate(
+                similarity=TrigramWordSimilarity(query, 'title')
+            ).order_by('-similarity').values_list('id', 'similarity')[:limit]
+        )
+
+        similar_tags = dict(
+            Tag.objects.filter(
+                published_post_count__gt=0,
+                name__trigram_word_similar=query,
+            ).annotate(
+                similarity=TrigramWordSimilarity(query, 'name')
+            ).values_list('id', 'similarity')
+        )
+        if similar_tags:
+            tagged = _published().filter(tags__in=similar_tags).values_list(
+                'id', 'tags'
+            ).order_by('-published_at')[:limit * 5]
+            for post_id, tag_id in tagged:
+                scores[post_id] = max(scores.get(post_id, 0), similar_tags[tag_id])
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return ranked[:limit]
+
+    return get_or_compute(search_key('fuzzy', _digest(query), limit), load, settings.SEARCH_CACHE_TIMEOUT)
+
+
+def search_ids(query, fuzzy=False, refresh=False):
+    """Ranked ids of published posts matching ``query``.
+
+    Returns ``(ids, fuzzy_used)``: full-text matches first, then any
+    trigram matches not already included. ``refresh`` recomputes the
+    cached entry instead of reading it.
+    """
+    query = normalise_query(query)
+
+    def load():
+        ids = list(full_text_search(query).values_list('id', flat=True)[:settings.SEARCH_RESULTS_LIMIT])
+        if not fuzzy and len(ids) >= settings.SEARCH_FUZZY_THRESHOLD:
+            return ids, False
+        seen = set(ids)
+        extra_ids = [post_id for post_id in fuzzy_post_ids(query) if post_id not in seen]
+        return ids + extra_ids, bool(extra_ids)
+
+    fetch = store if refresh else get_or_compute
+    return fetch(search_key('ids', _digest(query, fuzzy)), load, settings.SEARCH_CACHE_TIMEOUT)
+
+
+def search_page(query, page=1, fuzzy=False, refresh=False):
+    """One page of search results for ``query``.
+
+    Returns a dict with the page's ``posts`` (authors, categories and tags
+    loaded), the ``total`` number of results, ``fuzzy_used`` and
+    ``has_next``.
+    """
+    query = normalise_query(query)
+    page_size = settings.SEARCH_PAGE_SIZE
+
+    def load():
+        ids, fuzzy_used = search_ids(query, fuzzy=fuzzy, refresh=refresh)
+        page_ids = ids[(page - 1) * page_size:page * page_size]
+        posts = _published().select_related('author', 'category').prefetch_related('tags').in_bulk(page_ids)
+        return {
+            'posts': [posts[post_id] for post_id in page_ids if post_id in posts],
+            'total': len(ids),
+            'fuzzy_used': fuzzy_used,
+            'has_next': len(ids) > page * page_size,
+        }
+
+    fetch = store if refresh else get_or_compute
+    return fetch(search_key('page', _digest(query, fuzzy), page), load, settings.SEARCH_CACHE_TIMEOUT)
+
+
+def _popular_since():
+    return timezone.now() - timedelta(days=settings.SEARCH_POPULAR_WINDOW_DAYS)
+
+
+def popular_queries(limit):
+    """The most searched queries within ``SEARCH_POPULAR_WINDOW_DAYS``."""
+    return list(
+        SearchQueryStat.objects.filter(last_searched_at__gte=_popular_since())
+        .order_by('-count', 'query').values_list('query', flat=True)[:limit]
+    )
+
+
+def precompute_popular(limit=None):
+    """Recompute the first page of results for the most searched queries.
+
+    Returns the number of queries refreshed.
+    """
+    queries = popular_queries(limit or settings.SEARCH_PRECOMPUTE_SIZE)
+    for query in queries:
+        search_page(query, refresh=True)
+    return len(queries)
+
+
+def prune_query_stats():
+    """Forget queries nobody has searched within the popularity window."""
+    deleted, _ = SearchQueryStat.objects.filter(last_searched_at__lt=_popular_since()).delete()
+    return deleted
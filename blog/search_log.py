@@ -0,0 +1,71 @@
+"""Buffered counting of search queries.
+
+Searches are added to an in-process counter keyed on the normalised query
+and written to ``SearchQueryStat`` in batches, one ``UPDATE`` per known
+query and one ``bulk_create`` for new ones. The counts decide which
+queries the ``refresh_search_cache`` command precomputes. As with every
+``blog.buffering`` writer, the buffer is flushed after
+``SEARCH_LOG_FLUSH_INTERVAL`` seconds, when it holds
+``SEARCH_LOG_BATCH_SIZE`` distinct queries, and on interpreter exit.
+"""
+import atexit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .buffering import BufferedWriter
+from .models import SearchQueryStat
+from .search import normalise_query
+
+
+MAX_QUERY_LENGTH = SearchQueryStat._meta.get_field('query').max_length
+
+
+class QueryLog(BufferedWriter):
+    """Thread-safe counter of search queries."""
+
+    def __init__(self, batch_size=500, flush_interval=30.0):
+        super().__init__(batch_size, flush_interval)
+
+    def record(self, query):
+        """Count one search for ``query``; blank and overlong queries are ignored."""
+        query = normalise_query(query)
+        if not query or len(query) > MAX_QUERY_LENGTH:
+            return
+        self.add(query)
+
+    def write(self, batch):
+        _write_counts(batch)
+        return sum(batch.values())
+
+
+def _write_counts(batch):
+    now = timezone.now()
+    known = set(
+        SearchQueryStat.objects.filter(query__in=batch).values_list('query', flat=True)
+    )
+    with transaction.atomic():
+        for query in known:
+            SearchQueryStat.objects.filter(query=query).update(
+                count=F('count') + batch[query],
+                last_searched_at=now,
+            )
+        # Another process may insert the same new query first; losing one
+        # batch's worth of a brand-new query's count is fine for ranking
+        SearchQueryStat.objects.bulk_create(
+            [
+                SearchQueryStat(query=query, count=count, last_searched_at=now)
+                for query, count in batch.items()
+                if query not in known
+            ],
+            ignore_conflicts=True,
+        )
+
+
+query_log = QueryLog(
+    batch_size=settings.SEARCH_LOG_BATCH_SIZE,
+    flush_interval=settings.SEARCH_LOG_FLUSH_INTERVAL,
+)
+atexit.register(query_log.flush)
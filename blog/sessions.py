@@ -0,0 +1,33 @@
+"""Cached, database-backed sessions that skip redundant writes.
+
+Enable with ``SESSION_ENGINE = 'blog.sessions'``. Reads come from the
+cache like Django's ``cached_db`` engine, falling back to the database on
+a miss. Django saves a session whenever it is marked modified, even if the
+values assigned are the ones already stored; this store compares against
+what was loaded and skips the database and cache writes when nothing
+actually changed. An unchanged session keeps its existing expiry, as it
+would if it had not been touched at all.
+"""
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+
+class SessionStore(CachedDBStore):
+
+    def load(self):
+        data = super().load()
+        self._loaded_state = self._serialize(data)
+        return data
+
+    def save(self, must_create=False):
+        if (
+            not must_create
+            and self.session_key is not None
+            and getattr(self, '_loaded_state', None) is not None
+            and self._serialize(self._get_session(no_load=True)) == self._loaded_state
+        ):
+            return
+        super().save(must_create)
+        self._loaded_state = self._serialize(self._session)
+
+    def _serialize(self, data):
+        return self.serializer().dumps(data)
@@ -0,0 +1,172 @@
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .auth import invalidate_cached_user
+from .authors import invalidate_author_stats
+from .cache import invalidate_post_caches, invalidate_search_caches
+from .date_archive import adjust_month_buckets, month_of
+from .models import ArchivedPost, Category, Comment, Post, PostRevision, Tag, UserProfile
+from .revisions import record_revision
+from .tags import refresh_tag_stats, tag_ids_for_posts
+
+
+# Post fields that search results depend on (see blog.search)
+SEARCH_FIELDS = ('title', 'excerpt', 'status', 'category', 'published_at')
+
+
+def _is_view_count_update(kwargs):
+    update_fields = kwargs.get('update_fields')
+    return update_fields is not None and set(update_fields) == {'views_count'}
+
+
+@receiver(pre_save, sender=Post)
+def post_saving_compare(sender, instance, update_fields=None, **kwargs):
+    """Compare the post with its stored row before it is written.
+
+    Records whether the save can change any search results (only published
+    posts are searchable, so edits to drafts and to fields search doesn't
+    look at keep the cached results), how the archive month counts move,
+    whether the post was published or unpublished (for tag counts) and,
+    when the content is written, the content it replaces.
+    """
+    published = Post.Status.PUBLISHED
+    new = {
+        name: getattr(instance, Post._meta.get_field(name).attname)
+        for name in SEARCH_FIELDS
+    }
+    writes_search = update_fields is None or bool(set(SEARCH_FIELDS) & set(update_fields))
+    writes_content = update_fields is None or 'content' in update_fields
+    if instance._state.adding:
+        old, instance._previous_content = {}, ''
+    else:
+        # One read covers both, and neither is needed for a view count update
+        names = [*(SEARCH_FIELDS if writes_search else ()), *(('content',) if writes_content else ())]
+        row = (Post.objects.filter(pk=instance.pk).values(*names).first() or {}) if names else {}
+        instance._previous_content = row.pop('content', None)
+        old = row if writes_search else new
+
+    instance._search_changed = old != new and published in (old.get('status'), new['status'])
+    instance._published_changed = (old.get('status') == published) != (new['status'] == published)
+    instance._month_deltas = Counter()
+    if old.get('status') == published and old.get('published_at'):
+        instance._month_deltas[month_of(old['published_at'])] -= 1
+    if new['status'] == published and new['published_at']:
+        instance._month_deltas[month_of(new['published_at'])] += 1
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    """Drop cached listings and move archive counts whenever a post is written or removed."""
+    search_changed = vars(instance).pop('_search_changed', None)
+    month_deltas = vars(instance).pop('_month_deltas', None)
+    if _is_view_count_update(kwargs):
+        return
+    if search_changed is None:
+        # Deleted
+        search_changed = instance.status == Post.Status.PUBLISHED
+        month_deltas = (
+            {month_of(instance.published_at): -1}
+            if search_changed and instance.published_at else {}
+        )
+    invalidate_post_caches(search=search_changed)
+    invalidate_author_stats([instance.author_id])
+    adjust_month_buckets(month_deltas)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, **kwargs):
+    """Approved comments count towards the post author's stats.
+
+    Deletes are left to the stats timeout: a ``post_delete`` receiver would
+    stop Django from fast-deleting a post's comments when the post goes.
+    """
+    author_id = Post.objects.filter(pk=instance.post_id).values_list('author_id', flat=True).first()
+    if author_id is not None:
+        invalidate_author_stats([author_id])
+
+
+@receiver(post_save, sender=Post)
+def post_saved_record_revision(sender, instance, **kwargs):
+    """Keep a revision of every change to the content."""
+    previous_content = vars(instance).pop('_previous_content', None)
+    if previous_content is not None and previous_content != instance.content:
+        record_revision(instance, previous_content)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=ArchivedPost)
+def post_deleted_drop_revisions(sender, instance, **kwargs):
+    """Revisions outlive the move to the archive tables, but not the post itself."""
+    if (
+        not Post.objects.filter(pk=instance.pk).exists()
+        and not ArchivedPost.objects.filter(pk=instance.pk).exists()
+    ):
+        PostRevision.objects.filter(post_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Post)
+def post_saved_refresh_tags(sender, instance, created, **kwargs):
+    """Publishing or unpublishing moves the post in or out of its tags' counts."""
+    published_changed = vars(instance).pop('_published_changed', False)
+    if created or not published_changed:
+        return
+    refresh_tag_stats(tag_ids_for_posts([instance.pk]))
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting_remember_tags(sender, instance, **kwargs):
+    # Tag links are gone by post_delete, so capture them first
+    instance._deleted_tag_ids = tag_ids_for_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted_refresh_tags(sender, instance, **kwargs):
+    refresh_tag_stats(getattr(instance, '_deleted_tag_ids', ()))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep tag counts in step with tags being added to or removed from posts."""
+    if action == 'pre_clear' and not reverse:
+        instance._cleared_tag_ids = tag_ids_for_posts([instance.pk])
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        tag_ids = {instance.pk}
+    elif action == 'post_clear':
+        tag_ids = getattr(instance, '_cleared_tag_ids', set())
+    else:
+        tag_ids = pk_set
+    refresh_tag_stats(tag_ids)
+    # Fuzzy search matches posts by tag name
+    if reverse or instance.status == Post.Status.PUBLISHED:
+        invalidate_search_caches()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def search_terms_changed(sender, **kwargs):
+    """Category names and tag names are matched by search."""
+    invalidate_search_caches()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Drop the cached copy used by ``CachedModelBackend``."""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    # The cached user carries its profile
+    invalidate_cached_user(instance.user_id)
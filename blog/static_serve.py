@@ -0,0 +1,58 @@
+"""Serve collected static files from the app when no reverse proxy is in front.
+
+Fingerprinted files are served with far-future immutable caching, and the
+precompressed ``.br``/``.gz`` variants written at ``collectstatic`` time are
+picked according to the client's ``Accept-Encoding``.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.views.decorators.http import require_safe
+
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE = 'public, max-age=31536000, immutable'
+SHORT_LIVED = 'public, max-age=300'
+
+_hashed_names = None
+
+
+def _is_hashed(path):
+    global _hashed_names
+    if _hashed_names is None:
+        _hashed_names = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+    return path in _hashed_names
+
+
+@require_safe
+def serve(request, path):
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path.')
+    if not os.path.isfile(full_path):
+        raise Http404('Static file not found.')
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    accepted = {
+        token.split(';')[0].strip()
+        for token in request.headers.get('Accept-Encoding', '').split(',')
+    }
+
+    encoding = None
+    for candidate, suffix in ENCODINGS:
+        if candidate in accepted and os.path.isfile(full_path + suffix):
+            full_path, encoding = full_path + suffix, candidate
+            break
+
+    response = FileResponse(open(full_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = IMMUTABLE if _is_hashed(path) else SHORT_LIVED
+    return response
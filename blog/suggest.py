@@ -0,0 +1,227 @@
+"""In-memory prefix index behind the search box suggestions.
+
+Each process keeps sorted lists of ``(key, kind, object_id)`` tuples,
+where the keys are the normalised names of published posts (and every
+word-suffix of the title, so "dja" finds "Advanced Django Tips"), tags in
+use, categories and authors. A lookup is a ``bisect`` to the first key
+with the prefix and a bounded scan from there, so it costs no database
+work at all.
+
+The index is built on first use. When the posts version changes (see
+``blog.cache``) it is refreshed at most every ``SUGGEST_REFRESH_INTERVAL``
+seconds: only posts updated since the last refresh are re-read and patched
+in, while the small tag, category and author sets are reloaded whole. A
+full rebuild every ``SUGGEST_REBUILD_INTERVAL`` seconds catches deleted
+posts and bulk status changes that don't touch ``updated_at``.
+"""
+import bisect
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .cache import posts_version
+from .models import Category, Post, Tag
+
+
+MIN_PREFIX_LENGTH = 2
+MAX_TITLE_WORDS = 6
+# Upper bound on keys looked at per lookup, to keep short prefixes fast
+SCAN_LIMIT = 2000
+# How many suggestions of each kind may appear, in display order
+KIND_LIMITS = {'post': 5, 'tag': 3, 'category': 2, 'author': 2}
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    label: str
+    url: str
+    weight: int
+
+
+def normalise(text):
+    return ' '.join(text.casefold().split())
+
+
+def _title_keys(title):
+    words = normalise(title).split()[:MAX_TITLE_WORDS]
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+class SuggestionIndex:
+
+    def __init__(self):
+        # Posts are many and change a few at a time; everything else is small
+        # enough to replace wholesale on each refresh
+        self._post_keys = []
+        self._other_keys = []
+        self._suggestions = {}
+        self._names = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._built_at = None
+        self._checked_at = 0.0
+        self._version = None
+        self._posts_since = None
+
+    def suggest(self, prefix, limit=10):
+        """Up to ``limit`` suggestions for ``prefix``: posts, tags, categories, authors."""
+        prefix = normalise(prefix)
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        self._ensure_fresh()
+
+        matches = {}
+        with self._lock:
+            for keys in (self._post_keys, self._other_keys):
+                start = bisect.bisect_left(keys, (prefix,))
+                for key, kind, object_id in keys[start:start + SCAN_LIMIT]:
+                    if not key.startswith(prefix):
+                        break
+                    matches[kind, object_id] = self._suggestions[kind, object_id]
+
+        results = []
+        for kind, kind_limit in KIND_LIMITS.items():
+            of_kind = [s for s in matches.values() if s.kind == kind]
+            results += heapq.nlargest(kind_limit, of_kind, key=lambda s: s.weight)
+        return results[:limit]
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._built_at is None:
+            # Nothing to serve yet: wait for whoever is building it
+            with self._refresh_lock:
+                if self._built_at is None:
+                    self.rebuild()
+            return
+
+        due_rebuild = now - self._built_at > settings.SUGGEST_REBUILD_INTERVAL
+        due_check = now - self._checked_at > settings.SUGGEST_REFRESH_INTERVAL
+        if not (due_rebuild or due_check):
+            return
+        # Someone else is already refreshing; serve what we have
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = now
+            if due_rebuild:
+                self.rebuild()
+            elif posts_version() != self._version:
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def rebuild(self):
+        """Reload everything from the database."""
+        version = posts_version()
+        started = timezone.now()
+        post_keys, suggestions, names = self._build(
+            self._post_entries(Post.objects.filter(status=Post.Status.PUBLISHED))
+        )
+        other_keys, other_suggestions, other_names = self._build(self._other_entries())
+        suggestions.update(other_suggestions)
+        names.update(other_names)
+
+        with self._lock:
+            self._post_keys, self._other_keys = post_keys, other_keys
+            self._suggestions, self._names = suggestions, names
+            self._version = version
+            self._posts_since = started
+            self._built_at = self._checked_at = time.monotonic()
+
+    def refresh(self):
+        """Re-read posts changed since the last refresh; reload the small sets."""
+        version = posts_version()
+        started = timezone.now()
+        changed = Post.objects.filter(updated_at__gte=self._posts_since)
+        changed_ids = list(changed.values_list('id', flat=True))
+        post_keys, post_suggestions, post_names = self._build(
+            self._post_entries(changed.filter(status=Post.Status.PUBLISHED))
+        )
+        other_keys, other_suggestions, other_names = self._build(self._other_entries())
+
+        with self._lock:
+            for post_id in changed_ids:
+                for name in self._names.pop(('post', post_id), ()):
+                    index = bisect.bisect_left(self._post_keys, (name, 'post', post_id))
+                    del self._post_keys[index]
+                self._suggestions.pop(('post', post_id), None)
+            for entry in post_keys:
+                bisect.insort(self._post_keys, entry)
+            self._suggestions.update(post_suggestions)
+            self._names.update(post_names)
+
+            for key in [key for key in self._suggestions if key[0] != 'post']:
+                del self._suggestions[key]
+                del self._names[key]
+            self._other_keys = other_keys
+            self._suggestions.update(other_suggestions)
+            self._names.update(other_names)
+
+            self._version = version
+            self._posts_since = started
+
+    @staticmethod
+    def _build(entries):
+        keys = []
+        suggestions = {}
+        names = {}
+        for kind, object_id, object_names, suggestion in entries:
+            suggestions[kind, object_id] = suggestion
+            names[kind, object_id] = object_names
+            keys += [(name, kind, object_id) for name in object_names]
+        keys.sort()
+        return keys, suggestions, names
+
+    @staticmethod
+    def _post_entries(posts):
+        return [
+            (
+                'post', post_id, _title_keys(title),
+                Suggestion('post', title, reverse('blog:post_detail', args=[slug]), views),
+            )
+            for post_id, title, slug, views in posts.values_list(
+                'id', 'title', 'slug', 'views_count'
+            ).iterator()
+        ]
+
+    @staticmethod
+    def _other_entries():
+        entries = [
+            (
+                'tag', tag_id, {normalise(name)},
+                Suggestion('tag', f'#{name}', reverse('blog:tag_posts', args=[slug]), count),
+            )
+            for tag_id, name, slug, count in Tag.objects.filter(
+                published_post_count__gt=0
+            ).values_list('id', 'name', 'slug', 'published_post_count')
+        ]
+        entries += [
+            (
+                'category', category_id, {normalise(name)},
+                Suggestion('category', name, reverse('blog:category_posts', args=[name.lower()]), count),
+            )
+            for category_id, name, count in Category.objects.annotate(
+                published=Count('posts', filter=Q(posts__status=Post.Status.PUBLISHED))
+            ).filter(published__gt=0).values_list('id', 'name', 'published')
+        ]
+        entries += [
+            (
+                'author', user_id, {normalise(username)},
+                Suggestion('author', username, reverse('blog:author_posts', args=[username.lower()]), count),
+            )
+            for user_id, username, count in User.objects.filter(
+                posts__status=Post.Status.PUBLISHED
+            ).annotate(published=Count('posts')).values_list('id', 'username', 'published')
+        ]
+        return entries
+
+
+suggestion_index = SuggestionIndex()
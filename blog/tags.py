@@ -0,0 +1,91 @@
+"""Precomputed tag statistics behind the tag cloud and tag pages."""
+import math
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Post, Tag, TagCooccurrence
+
+
+TagLink = Post.tags.through
+
+
+def tag_ids_for_posts(post_ids):
+    """Return the ids of every tag attached to the given posts."""
+    return set(
+        TagLink.objects.filter(post_id__in=post_ids).values_list('tag_id', flat=True)
+    )
+
+
+def refresh_tag_stats(tag_ids):
+    """Recompute published-post counts and co-occurrence rows for ``tag_ids``.
+
+    Only the given tags are touched, so callers pass the tags of the posts
+    that changed rather than rebuilding everything.
+    """
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return
+
+    published_links = TagLink.objects.filter(
+        tag_id__in=tag_ids,
+        post__status=Post.Status.PUBLISHED,
+    )
+
+    counts = dict(
+        published_links.values_list('tag_id').annotate(total=Count('post_id')).order_by()
+    )
+
+    pairs = Counter()
+    rows = (
+        published_links.values_list('tag_id', 'post__tags')
+        .annotate(total=Count('post_id'))
+        .order_by()
+    )
+    for tag_id, other_id, total in rows:
+        if other_id is not None and other_id != tag_id:
+            pairs[tag_id, other_id] = total
+
+    with transaction.atomic():
+        tags = list(Tag.objects.filter(id__in=tag_ids).only('id'))
+        for tag in tags:
+            tag.published_post_count = counts.get(tag.id, 0)
+        Tag.objects.bulk_update(tags, ['published_post_count'])
+
+        # Pairs are stored in both directions; refresh both sides for these tags
+        TagCooccurrence.objects.filter(tag_id__in=tag_ids).delete()
+        TagCooccurrence.objects.filter(other_id__in=tag_ids).delete()
+        TagCooccurrence.objects.bulk_create(
+            [
+                TagCooccurrence(tag_id=tag_id, other_id=other_id, count=total)
+                for (tag_id, other_id), total in pairs.items()
+            ]
+            + [
+                TagCooccurrence(tag_id=other_id, other_id=tag_id, count=total)
+                for (tag_id, other_id), total in pairs.items()
+                if other_id not in tag_ids
+            ]
+        )
+
+
+def rebuild_tag_stats(batch_size=500):
+    """Recompute statistics for every tag, ``batch_size`` tags at a time."""
+    tag_ids = list(Tag.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(tag_ids), batch_size):
+        refresh_tag_stats(tag_ids[start:start + batch_size])
+    return len(tag_ids)
+
+
+def cloud_weights(tags, steps=5):
+    """Attach a 1..``steps`` ``weight`` to each tag on a log scale of its count."""
+    tags = list(tags)
+    if not tags:
+        return tags
+
+    counts = [math.log(tag.published_post_count + 1) for tag in tags]
+    low, high = min(counts), max(counts)
+    spread = (high - low) or 1
+    for tag, count in zip(tags, counts):
+        tag.weight = 1 + round((count - low) / spread * (steps - 1))
+    return tags
@@ -0,0 +1,77 @@
+import struct
+import zlib
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from .archive import archive_posts
+from .forms import UserProfileForm
+from .models import ArchivedPost, Post, PostRevision
+from .revisions import revision_content
+
+
+class ArchivedPostRevisionTests(TestCase):
+    """Revision history survives moving a post to the archive tables."""
+
+    def setUp(self):
+        author = User.objects.create_user('author', password='secret')
+        self.post = Post.objects.create(
+            title='Edited post',
+            content='first draft\n',
+            author=author,
+            status=Post.Status.PUBLISHED,
+        )
+        self.post.content = 'first draft\nsecond paragraph\n'
+        self.post.save()
+        self.post.content = 'final draft\nsecond paragraph\n'
+        self.post.save()
+
+    def test_archiving_keeps_revisions(self):
+        self.assertEqual(PostRevision.objects.filter(post_id=self.post.pk).count(), 3)
+
+        self.post.status = Post.Status.ARCHIVED
+        self.post.save()
+        self.assertEqual(archive_posts(), 1)
+
+        self.assertFalse(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertTrue(ArchivedPost.objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(PostRevision.objects.filter(post_id=self.post.pk).count(), 3)
+        self.assertEqual(revision_content(self.post.pk, 1), 'first draft\n')
+        self.assertEqual(revision_content(self.post.pk, 3), 'final draft\nsecond paragraph\n')
+
+    def test_deleting_archived_post_drops_revisions(self):
+        self.post.status = Post.Status.ARCHIVED
+        self.post.save()
+        archive_posts()
+
+        ArchivedPost.objects.filter(pk=self.post.pk).delete()
+        self.assertFalse(PostRevision.objects.filter(post_id=self.post.pk).exists())
+
+    def test_deleting_post_drops_revisions(self):
+        self.post.delete()
+        self.assertFalse(PostRevision.objects.filter(post_id=self.post.pk).exists())
+
+
+def _png_chunk(kind, data=b''):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def _png_header(width, height):
+    """A PNG with no pixel data whose header claims ``width`` x ``height`` pixels."""
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + _png_chunk(b'IDAT')
+        + _png_chunk(b'IEND')
+    )
+
+
+class AvatarUploadTests(TestCase):
+    """Oversized avatars are rejected from the header, without decoding."""
+
+    def test_decompression_bomb_is_rejected(self):
+        upload = SimpleUploadedFile('bomb.png', _png_header(20000, 20000), content_type='image/png')
+        form = UserProfileForm(data={}, files={'avatar': upload})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['avatar'], ['This image is too large. Please upload a smaller one.'])
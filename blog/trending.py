@@ -0,0 +1,122 @@
+"""Trending posts, categories and authors.
+
+``compute_trending`` scores posts, authors and categories from their
+hourly ``ViewRollup`` rows in the last ``TRENDING_WINDOW_HOURS``, each
+hour's views weighted by ``exp(-decay * age)`` so a view loses half its
+weight every ``TRENDING_HALF_LIFE_HOURS``. The top ``TRENDING_SIZE`` of each
+kind are stored as ``TrendingEntry`` rows, so pages only read short ranked
+lists.
+"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import get_or_compute, versioned_key
+from .models import Category, Post, TrendingEntry, ViewRollup
+from .view_events import hour_start
+
+
+def compute_trending(now=None, size=None):
+    """Rebuild the stored trending lists. Returns the number of posts scored."""
+    now = now or timezone.now()
+    size = size or settings.TRENDING_SIZE
+    window_start = hour_start(now) - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    decay = math.log(2) / settings.TRENDING_HALF_LIFE_HOURS
+
+    # Rollups share a handful of distinct hours, so each weight is computed once
+    weights = {}
+    scores = {kind: defaultdict(float) for kind in TrendingEntry.Kind.values}
+
+    rollups = ViewRollup.objects.filter(
+        period=ViewRollup.Period.HOUR,
+        start__gte=window_start,
+    ).exclude(
+        # Posts that have since been unpublished drop out of the post list
+        Q(dimension=ViewRollup.Dimension.POST)
+        & ~Q(object_id__in=Post.objects.filter(status=Post.Status.PUBLISHED).values('id'))
+    ).values_list('dimension', 'object_id', 'start', 'views')
+
+    for dimension, object_id, hour, views in rollups.iterator(chunk_size=5000):
+        weight = weights.get(hour)
+        if weight is None:
+            age = (now - hour).total_seconds() / 3600
+            weight = weights[hour] = math.exp(-decay * max(age, 0))
+        scores[dimension][object_id] += views * weight
+
+    entries = []
+    for kind, kind_scores in scores.items():
+        top = heapq.nlargest(size, kind_scores.items(), key=lambda item: item[1])
+        entries += [
+            TrendingEntry(kind=kind, rank=rank, object_id=object_id, score=score, computed_at=now)
+            for rank, (object_id, score) in enumerate(top, start=1)
+        ]
+
+    with transaction.atomic():
+        TrendingEntry.objects.all().delete()
+        TrendingEntry.objects.bulk_create(entries)
+    invalidate_trending()
+    return len(scores[TrendingEntry.Kind.POST])
+
+
+def invalidate_trending():
+    cache.delete_many([_cache_key(kind) for kind in TrendingEntry.Kind.values])
+
+
+def _cache_key(kind):
+    return versioned_key('trending', kind)
+
+
+def _ranked_ids(kind, limit):
+    return list(
+        TrendingEntry.objects.filter(kind=kind).order_by('rank')
+        .values_list('object_id', flat=True)[:limit]
+    )
+
+
+def _in_rank_order(objects, ids):
+    by_id = {obj.pk: obj for obj in objects}
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def trending_posts(limit=None):
+    """Published trending posts, hottest first."""
+    def load():
+        ids = _ranked_ids(TrendingEntry.Kind.POST, settings.TRENDING_SIZE)
+        posts = Post.objects.select_related('author', 'category').filter(
+            pk__in=ids,
+            status=Post.Status.PUBLISHED,
+        )
+        return _in_rank_order(posts, ids)
+
+    posts = get_or_compute(_cache_key(TrendingEntry.Kind.POST), load, settings.TRENDING_CACHE_TIMEOUT)
+    return posts[:limit]
+
+
+def trending_categories(limit=None):
+    def load():
+        ids = _ranked_ids(TrendingEntry.Kind.CATEGORY, settings.TRENDING_SIZE)
+        return _in_rank_order(Category.objects.filter(pk__in=ids), ids)
+
+    categories = get_or_compute(
+        _cache_key(TrendingEntry.Kind.CATEGORY), load, settings.TRENDING_CACHE_TIMEOUT
+    )
+    return categories[:limit]
+
+
+def trending_authors(limit=None):
+    def load():
+        ids = _ranked_ids(TrendingEntry.Kind.AUTHOR, settings.TRENDING_SIZE)
+        return _in_rank_order(User.objects.select_related('profile').filter(pk__in=ids), ids)
+
+    authors = get_or_compute(
+        _cache_key(TrendingEntry.Kind.AUTHOR), load, settings.TRENDING_CACHE_TIMEOUT
+    )
+    return authors[:limit]
@@ -13,6 +13,8 @@ urlpatterns = [
     path('login/', views.LoginView.as_view(), name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('profile/update/', views.UserProfileUpdateView.as_view(), name='profile_update'),
+    path('profile/delete/', views.account_delete, name='account_delete'),
+    path('avatars/<str:username>/<int:size>/', views.avatar, name='avatar'),
 
     # --- CRUD Function-Based Views ---
     path('posts/', views.post_list, name='posts'),  # list all posts
@@ -21,9 +23,25 @@ urlpatterns = [
     path('posts/<slug:slug>/update/', views.post_update, name='post_update'),  # update post
     path('posts/<slug:slug>/delete/', views.post_delete, name='post_delete'),  # delete post
 
+    # --- Comments ---
+    path('posts/<slug:slug>/comment/', views.comment_create, name='comment_create'),
+    path('moderation/comments/', views.comment_moderation, name='comment_moderation'),
+    path('dashboard/analytics/', views.analytics_dashboard, name='analytics_dashboard'),
+
     # --- Filter Views ---
     path('category/<str:category_name>/', views.category_posts, name='category_posts'),
     path('author/<str:author_name>/', views.author_posts, name='author_posts'),
+    path('authors/', views.author_directory, name='author_directory'),
+    path('authors/autocomplete/', views.author_autocomplete, name='author_autocomplete'),
     path('search/', views.search_posts, name='search_posts'),
+    path('search/suggest/', views.search_suggest, name='search_suggest'),
     path('featured-posts/', views.featured_posts, name='featured_posts'),
+    path('tags/', views.tag_cloud, name='tag_cloud'),
+    path('trending/', views.trending, name='trending'),
+    path('tags/<slug:slug>/', views.tag_posts, name='tag_posts'),
+
+    # --- Date Archive ---
+    path('archive/', views.archive_index, name='archive_index'),
+    path('archive/<int:year>/', views.archive_year, name='archive_year'),
+    path('archive/<int:year>/<int:month>/', views.archive_month, name='archive_month'),
 ]
\ No newline at end of file
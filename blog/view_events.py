@@ -0,0 +1,77 @@
+"""Buffered post view counting.
+
+Post views are added to an in-process counter keyed on ``(slug, hour)``
+instead of being written one ``UPDATE`` per request. A flush resolves the
+slugs of published posts in one query, writes one ``views_count``
+increment per post and appends the hourly counts to the analytics event
+log (see ``blog.analytics``); views of unknown or unpublished slugs are
+dropped. As with every ``blog.buffering`` writer, the buffer is flushed
+after ``VIEW_EVENTS_FLUSH_INTERVAL`` seconds, when it holds
+``VIEW_EVENTS_BATCH_SIZE`` distinct keys, and on interpreter exit.
+"""
+import atexit
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .analytics import event_log
+from .buffering import BufferedWriter
+from .models import Post
+
+
+logger = logging.getLogger(__name__)
+
+
+def hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class ViewRecorder(BufferedWriter):
+    """Thread-safe counter of post views."""
+
+    def record(self, slug, when=None):
+        """Count one view of the post at ``slug`` at ``when`` (default: now)."""
+        self.add((slug, hour_start(when or timezone.now())))
+
+    def write(self, batch):
+        return _write_views(batch)
+
+
+def _write_views(batch):
+    posts = {
+        slug: (post_id, category_id, author_id)
+        for slug, post_id, category_id, author_id in Post.objects.filter(
+            slug__in={slug for slug, _ in batch},
+            status=Post.Status.PUBLISHED,
+        ).values_list('slug', 'id', 'category_id', 'author_id')
+    }
+
+    events = []
+    totals = Counter()
+    for (slug, hour), views in batch.items():
+        if slug in posts:
+            post_id, category_id, author_id = posts[slug]
+            events.append((hour, post_id, category_id, author_id, views))
+            totals[post_id] += views
+
+    with transaction.atomic():
+        for post_id, views in totals.items():
+            Post.objects.filter(pk=post_id).update(views_count=F('views_count') + views)
+    try:
+        event_log.append(events)
+    except OSError:
+        # The counters are committed, so retrying the flush would count these
+        # views twice; lose the analytics copy instead
+        logger.exception('Could not append %d view event(s) to the analytics log', len(events))
+    return sum(totals.values())
+
+
+view_recorder = ViewRecorder(
+    batch_size=settings.VIEW_EVENTS_BATCH_SIZE,
+    flush_interval=settings.VIEW_EVENTS_FLUSH_INTERVAL,
+)
+atexit.register(view_recorder.flush)
@@ -1,37 +1,65 @@
 from django.shortcuts import render, redirect
-from django.http import Http404
-from datetime import datetime
+from django.http import Http404, FileResponse, JsonResponse
+from django.conf import settings
+from django.core.files.storage import default_storage
+import math
+from datetime import date, datetime
+from string import ascii_uppercase
 from django.contrib import messages
 from django.core.paginator import Paginator
-from .models import Post, Category
+from .models import EditConflict, Post, Category, Tag, Comment, UserProfile
+from .images import THUMBNAIL_FORMATS, get_thumbnail
+from .comment_queue import comment_queue
+from .archive import get_archived_post
+from .analytics import author_dashboard
+from .authors import (
+    author_stats,
+    autocomplete,
+    directory_page,
+    letter_counts,
+)
+from .cache import (
+    WARMUP_HEADER,
+    cache_public_page,
+    get_or_compute,
+    versioned_key,
+)
+from .bulk import set_comments_approved
+from .deletion import close_account, soft_delete_posts
+from .date_archive import archive_months, month_range, published_in
+from .facets import facet_counts, filtered_page, parse_filters
+from .search import search_page
+from .search_log import query_log
+from .suggest import suggestion_index
+from .tags import cloud_weights
+from .trending import trending_authors, trending_categories, trending_posts
+from .view_events import view_recorder
 from django.shortcuts import render, get_object_or_404, redirect
-from django.contrib.auth.decorators import login_required
-from .forms import PostForm, RegistrationForm, LoginForm, UserProfileForm
+from django.contrib.auth.decorators import login_required, permission_required
+from django.views.decorators.http import require_POST
+from .forms import PostForm, RegistrationForm, LoginForm, UserProfileForm, CommentForm
 from django.contrib.auth.models import User
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib.auth.views import LoginView
 from django.contrib.auth import authenticate, login, logout
 from django.views import View
-from django.db.models import Q
 
 
 # ------------------ VIEWS ------------------
 
+@cache_public_page
 def home(request):
     """Home page view with dynamic data"""
     
-    published_posts = Post.objects.filter(status__iexact="published")
-
-    total_posts = published_posts.count()
-
-    total_authors = published_posts.values("author").distinct().count()
+    total_posts, total_authors = get_or_compute(
+        versioned_key('home_stats'), _home_stats, settings.STATS_CACHE_TIMEOUT
+    )
 
     categories = Category.objects.all()
     
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         "site_name": "BlogHub",
@@ -52,17 +80,21 @@ def home(request):
         "spotlight_topic": "Web Development",
 
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/home.html', context)
 
 
+def _home_stats():
+    published_posts = Post.objects.filter(status=Post.Status.PUBLISHED)
+    return published_posts.count(), published_posts.values("author").distinct().count()
+
+
+@cache_public_page
 def about(request):
     """About page view"""
     
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         'company_name': 'BlogHub Team',
@@ -76,7 +108,6 @@ def about(request):
             {'name': 'Emma Rodriguez', 'role': 'Head of Content'},
         ],
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/about.html', context)
 
@@ -113,9 +144,8 @@ def contact(request):
             # Redirect to avoid form resubmission
             return redirect('blog:contact')
     
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     # GET request or after POST redirect
     context = {
@@ -134,7 +164,6 @@ def contact(request):
             {'platform': 'Instagram', 'link': 'instagram.com/bloghub'},
         ],
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/contact.html', context)
 
@@ -156,15 +185,13 @@ def posts(request):
         is_featured=True
     )[:3]
     
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         'posts': posts,
         'featured_posts': featured_posts,
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/posts.html', context)
 
@@ -189,20 +216,19 @@ def post_detail(request, slug):
     # Get approved comments
     comments = post.comments.filter(is_approved=True)
     
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         'post': post,
         'related_posts': related_posts,
         'comments': comments,
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/post_detail.html', context)
 
 
+@cache_public_page
 def category_posts(request, category_name):
     """
     Display posts filtered by category
@@ -226,59 +252,148 @@ def category_posts(request, category_name):
         status=Post.Status.PUBLISHED
     ).select_related('author', 'category').prefetch_related('tags')
     
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
 
     context = {
         'category_name': category.name,
         'posts': filtered_posts,
         'total_posts': filtered_posts.count(),
         'categories': categories,
-        'authors': authors,
         'current_year': datetime.now().year,
         'site_name': 'BlogHub',
     }
     return render(request, 'blog/category_posts.html', context)
 
 
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_QUERY = 100
+
+
+SEARCH_FACETS = [
+    ('category', 'Category'),
+    ('tag', 'Tag'),
+    ('author', 'Author'),
+    ('year', 'Year'),
+    ('month', 'Month'),
+]
+
+
+def _search_url(params, **changes):
+    """The current search URL with ``changes`` applied and paging reset."""
+    params = params.copy()
+    for name in ('page', 'after'):
+        params.pop(name, None)
+    if 'year' in changes:
+        params.pop('month', None)
+    for name, value in changes.items():
+        if value is None:
+            params.pop(name, None)
+        else:
+            params[name] = value
+    return '?' + params.urlencode()
+
+
+def _facet_groups(params, counts, filters):
+    groups = []
+    for name, label in SEARCH_FACETS:
+        values = [
+            {
+                **value,
+                'active': filters.get(name) == value['value'],
+                # Clicking the active value removes the filter
+                'url': _search_url(params, **{
+                    name: None if filters.get(name) == value['value'] else value['value']
+                }),
+            }
+            for value in counts[name]
+        ]
+        if values:
+            groups.append({'name': name, 'label': label, 'values': values})
+    return groups
+
+
 def search_posts(request):
     """
-    Search posts by title or content
+    Search published posts, optionally narrowed by facets
     
-    URL: /search/?q=django
-    Searches in post title and excerpt
+    URL: /search/?q=django[&page=2][&fuzzy=1]
+         /search/?q=django&category=web&tag=orm&author=alice&year=2025&month=3[&after=<post id>]
+    Full-text search on title and excerpt, topped up with typo-tolerant
+    matches on titles and tags when there are few results. Pages of
+    results are cached per normalised query; first-page searches are
+    counted so the popular ones can be precomputed. With facet filters,
+    results are paged with a post id cursor instead.
     """
     # Get search query from URL parameters
     query = request.GET.get('q', '').strip()
-
-    # Start with an empty queryset
-    search_results = Post.objects.none()
-
-    if query:
-        search_results = Post.objects.filter(
-            status=Post.Status.PUBLISHED
-        ).filter(
-            Q(title__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(category__name__icontains=query)
-        ).select_related('author', 'category').prefetch_related('tags')
-    else:
-        # If no query: return all published posts
-        search_results = Post.objects.filter(
-            status=Post.Status.PUBLISHED
-        ).select_related('author', 'category').prefetch_related('tags')
-
+    fuzzy_requested = request.GET.get('fuzzy') == '1'
+    filters = parse_filters(request.GET)
+    page = request.GET.get('page', '')
+    # Results are capped, so so are the pages worth caching
+    max_page = math.ceil(
+        (settings.SEARCH_RESULTS_LIMIT + settings.SEARCH_FUZZY_LIMIT) / settings.SEARCH_PAGE_SIZE
+    )
+    page = min(int(page), max_page) if page.isdigit() and int(page) > 0 else 1
+    after = request.GET.get('after', '')
+    after = int(after) if after.isdigit() else None
+
+    searched = bool(query or filters)
+    # Counting every published post for the empty search page costs a full
+    # scan per facet on each cache miss; facets appear once there is a search
+    counts = facet_counts(query, filters, fuzzy=fuzzy_requested) if searched else None
     context = {
         'query': query,
-        'posts': search_results,
-        'total_results': search_results.count(),
+        'filters': filters,
+        'searched': searched,
+        'facet_groups': _facet_groups(request.GET, counts, filters) if searched else [],
+        'clear_filters_url': _search_url(request.GET, **{name: None for name, _ in SEARCH_FACETS}),
+        'posts': [],
+        'total_results': 0,
+        'fuzzy_used': False,
+        'fuzzy_url': _search_url(request.GET, fuzzy='1'),
+        'previous_url': None,
+        'next_url': None,
     }
+    if filters:
+        posts, next_cursor, fuzzy_used = filtered_page(
+            query, filters, after=after, fuzzy=fuzzy_requested,
+            page_size=settings.SEARCH_PAGE_SIZE,
+        )
+        context.update({
+            'posts': posts,
+            'total_results': counts['total'],
+            'fuzzy_used': fuzzy_used,
+            'previous_url': _search_url(request.GET) if after else None,
+            'next_url': _search_url(request.GET, after=str(next_cursor)) if next_cursor else None,
+        })
+    elif query:
+        results = search_page(query, page=page, fuzzy=fuzzy_requested)
+        context.update({
+            'posts': results['posts'],
+            'total_results': results['total'],
+            'fuzzy_used': results['fuzzy_used'],
+            'previous_url': _search_url(request.GET, page=str(page - 1)) if page > 1 else None,
+            'next_url': _search_url(request.GET, page=str(page + 1)) if results['has_next'] else None,
+        })
+    if query and page == 1 and not after and not request.headers.get(WARMUP_HEADER):
+        query_log.record(query)
     return render(request, 'blog/search_results.html', context)
 
 
+def search_suggest(request):
+    """JSON suggestions for the search box, served from the in-memory index."""
+    query = request.GET.get('q', '')[:SUGGEST_MAX_QUERY]
+    results = [
+        {'kind': suggestion.kind, 'label': suggestion.label, 'url': suggestion.url}
+        for suggestion in suggestion_index.suggest(query, limit=SUGGEST_LIMIT)
+    ]
+    return JsonResponse({'results': results})
+
+
+@cache_public_page
 def author_posts(request, author_name):
-    """Display posts filtered by author.
+    """Author profile page: profile details, cached stats and their posts.
 
     URL: /author/<author name>/
     Shows only posts written by this author.
@@ -289,7 +404,8 @@ def author_posts(request, author_name):
         return redirect('blog:author_posts', author_name=author_name.lower())
 
     # Get the author (case-insensitive)
-    author = get_object_or_404(User, username__iexact=author_name)
+    author = get_object_or_404(User.objects.select_related('profile'), username__iexact=author_name)
+    profile = getattr(author, 'profile', None)
 
     # Get the author's published posts
     filtered_posts = Post.objects.filter(
@@ -297,22 +413,70 @@ def author_posts(request, author_name):
         status=Post.Status.PUBLISHED
     ).select_related('author', 'category').prefetch_related('tags')
 
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
 
     context = {
         'posts': filtered_posts,
-        'total_posts': filtered_posts.count(),
+        'total_posts': len(filtered_posts),
         'author_name': author.username,
+        'author': author,
+        'profile': profile,
+        'stats': author_stats(author),
         'current_year': datetime.now().year,
         'site_name': 'BlogHub',
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/author_posts.html', context)
 
 
+DIRECTORY_LETTERS = [*ascii_uppercase, '#']
+AUTOCOMPLETE_MAX_QUERY = 50
+
+
+@cache_public_page
+def author_directory(request):
+    """
+    Browse authors alphabetically
+    
+    URL: /authors/?letter=A&after=<username>
+    Pages are cut with a username cursor, so deep pages stay cheap.
+    """
+    letter = request.GET.get('letter', '').upper()
+    if letter not in DIRECTORY_LETTERS:
+        letter = ''
+    after = request.GET.get('after', '')
+
+    page, next_cursor = directory_page(
+        letter=letter or None,
+        after=after,
+        page_size=settings.AUTHOR_DIRECTORY_PAGE_SIZE,
+    )
+
+    # Get categories for navbar
+    categories = Category.objects.all()
+
+    context = {
+        'directory_authors': page,
+        'letter': letter,
+        'letters': [(bucket, letter_counts().get(bucket, 0)) for bucket in DIRECTORY_LETTERS],
+        'next_cursor': next_cursor,
+        'categories': categories,
+    }
+    return render(request, 'blog/author_directory.html', context)
+
+
+def author_autocomplete(request):
+    """JSON list of authors whose username starts with ``?q=``."""
+    usernames = autocomplete(request.GET.get('q', '')[:AUTOCOMPLETE_MAX_QUERY])
+    results = [
+        {'username': username, 'url': reverse('blog:author_posts', args=[username.lower()])}
+        for username in usernames
+    ]
+    return JsonResponse({'results': results})
+
+
+@cache_public_page
 def featured_posts(request):
     """Featured posts view"""
     # Get featured + published posts from DB
@@ -323,50 +487,363 @@ def featured_posts(request):
         )
         .select_related("author", "category")
         .prefetch_related("tags")
-        .order_by("-date")[:6]
+        .order_by("-published_at")[:6]
     )
 
-    # Get categories and authors for navbar
+    # Get categories for navbar
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
 
     context = {
         "posts_list": featured_posts,
         "site_name": "BlogHub",
         'categories': categories,
-        'authors': authors,
     }
     return render(request, 'blog/featured_posts.html', context)
 
 
+TAG_CLOUD_SIZE = 100
+TAG_POSTS_PER_PAGE = 12
+TRENDING_SIDEBAR_SIZE = 5
+ANALYTICS_DAYS = 30
+
+
+@cache_public_page
+def tag_cloud(request):
+    """Site-wide tag cloud built from the precomputed tag counts."""
+    top_tags = Tag.objects.filter(
+        published_post_count__gt=0
+    ).order_by('-published_post_count')[:TAG_CLOUD_SIZE]
+    tags = sorted(cloud_weights(top_tags), key=lambda tag: tag.name.lower())
+
+    categories = Category.objects.all()
+
+    context = {
+        'tags': tags,
+        'categories': categories,
+    }
+    return render(request, 'blog/tag_cloud.html', context)
+
+
+@cache_public_page
+def trending(request):
+    """Posts, categories and authors with the most recent views."""
+    categories = Category.objects.all()
+
+    context = {
+        'trending_posts': trending_posts(),
+        'trending_categories': trending_categories(TRENDING_SIDEBAR_SIZE),
+        'trending_authors': trending_authors(TRENDING_SIDEBAR_SIZE),
+        'categories': categories,
+    }
+    return render(request, 'blog/trending.html', context)
+
+
+@cache_public_page
+def tag_posts(request, slug):
+    """
+    Display published posts with a tag, newest first
+    
+    URL: /tags/django/?before=<post id>
+    Uses keyset pagination on post id so deep pages stay cheap.
+    """
+    tag = get_object_or_404(Tag, slug=slug)
+
+    tagged_posts = Post.objects.filter(
+        tags=tag,
+        status=Post.Status.PUBLISHED
+    ).select_related('author', 'category').prefetch_related('tags').order_by('-id')
+
+    before = request.GET.get('before', '')
+    if before.isdigit():
+        tagged_posts = tagged_posts.filter(id__lt=int(before))
+
+    page = list(tagged_posts[:TAG_POSTS_PER_PAGE + 1])
+    has_next = len(page) > TAG_POSTS_PER_PAGE
+    page = page[:TAG_POSTS_PER_PAGE]
+
+    related_tags = [
+        row.other for row in tag.cooccurrences.select_related('other').order_by('-count')[:10]
+    ]
+
+    categories = Category.objects.all()
+
+    context = {
+        'tag': tag,
+        'posts': page,
+        'next_cursor': page[-1].id if has_next else None,
+        'is_first_page': not before,
+        'related_tags': related_tags,
+        'categories': categories,
+    }
+    return render(request, 'blog/tag_posts.html', context)
+
+
+# ------------------ DATE ARCHIVE ------------------
+
+
+def _archive_page(request, start, end, total):
+    """One page of the posts published in ``[start, end)``, newest first.
+
+    ``total`` comes from the month buckets, so paging needs no ``COUNT``.
+    """
+    page_size = settings.ARCHIVE_PAGE_SIZE
+    page_count = max(1, math.ceil(total / page_size))
+    page = request.GET.get('page', '')
+    page = min(int(page), page_count) if page.isdigit() and int(page) > 0 else 1
+
+    posts = published_in(start, end).select_related('author', 'category').prefetch_related(
+        'tags'
+    ).order_by('-published_at')[(page - 1) * page_size:page * page_size]
+    return {
+        'posts': list(posts),
+        'page': page,
+        'page_count': page_count,
+        'total_posts': total,
+    }
+
+
+@cache_public_page
+def archive_index(request):
+    """
+    Every month with published posts, grouped by year
+    
+    URL: /archive/
+    Counts come from the month buckets, so no posts are read.
+    """
+    years = {}
+    for month, count in archive_months():
+        years.setdefault(month.year, []).append({'month': month, 'count': count})
+
+    categories = Category.objects.all()
+
+    context = {
+        'years': [
+            {'year': year, 'months': months, 'total': sum(month['count'] for month in months)}
+            for year, months in years.items()
+        ],
+        'categories': categories,
+    }
+    return render(request, 'blog/archive_index.html', context)
+
+
+@cache_public_page
+def archive_year(request, year):
+    """
+    Posts published in a year, newest first
+    
+    URL: /archive/2025/?page=2
+    """
+    months = [
+        {'month': month, 'count': count}
+        for month, count in archive_months() if month.year == year
+    ]
+    if not months:
+        raise Http404('No posts were published in this year.')
+
+    start, end = month_range(year)
+    categories = Category.objects.all()
+
+    context = {
+        **_archive_page(request, start, end, sum(month['count'] for month in months)),
+        'period': date(year, 1, 1),
+        'year': year,
+        'months': months,
+        'categories': categories,
+    }
+    return render(request, 'blog/archive_period.html', context)
+
+
+@cache_public_page
+def archive_month(request, year, month):
+    """
+    Posts published in a month, newest first
+    
+    URL: /archive/2025/3/?page=2
+    """
+    period = date(year, month, 1) if 1 <= year < 9999 and 1 <= month <= 12 else None
+    total = dict(archive_months()).get(period)
+    if not total:
+        raise Http404('No posts were published in this month.')
+
+    start, end = month_range(year, month)
+    categories = Category.objects.all()
+
+    context = {
+        **_archive_page(request, start, end, total),
+        'period': period,
+        'year': year,
+        'month': month,
+        'categories': categories,
+    }
+    return render(request, 'blog/archive_period.html', context)
+
+
+# ------------------ COMMENTS ------------------
+
+MODERATION_PAGE_SIZE = 50
+
+
+@login_required(login_url='blog:login')
+@require_POST
+def comment_create(request, slug):
+    """Queue a comment on a published post for moderation."""
+    post = get_object_or_404(
+        Post.objects.only('id', 'slug', 'allow_comments'),
+        slug=slug,
+        status=Post.Status.PUBLISHED
+    )
+
+    if not post.allow_comments:
+        messages.error(request, 'Comments are closed for this post.')
+        return redirect("blog:post_detail", slug=post.slug)
+
+    form = CommentForm(request.POST)
+    if form.is_valid():
+        comment_queue.put(post.id, request.user.id, form.cleaned_data['content'])
+        messages.success(request, 'Thanks! Your comment will appear once it is approved.')
+    else:
+        messages.error(request, 'Please write a comment before submitting.')
+    return redirect("blog:post_detail", slug=post.slug)
+
+
+@login_required(login_url='blog:login')
+def analytics_dashboard(request):
+    """View statistics for the logged-in author's posts, read from the rollups."""
+    stats = author_dashboard(request.user, days=ANALYTICS_DAYS)
+
+    categories = Category.objects.all()
+
+    context = {
+        **stats,
+        'days': ANALYTICS_DAYS,
+        'categories': categories,
+    }
+    return render(request, 'blog/analytics_dashboard.html', context)
+
+
+@permission_required('blog.change_comment', login_url='blog:login')
+def comment_moderation(request):
+    """
+    Moderation workspace for pending comments
+    
+    GET: Show the oldest pending comments, paged by id (?after=<comment id>)
+    POST: Approve or reject the selected comments in one query
+    """
+    after = request.GET.get('after', '')
+    after = int(after) if after.isdigit() else 0
+
+    if request.method == 'POST':
+        comment_ids = [int(pk) for pk in request.POST.getlist('comment_ids') if pk.isdigit()]
+        pending = Comment.objects.filter(id__in=comment_ids, is_approved=False)
+        action = request.POST.get('action')
+
+        if not comment_ids:
+            messages.error(request, 'Select at least one comment.')
+        elif action == 'approve':
+            updated = set_comments_approved(pending, True)
+            messages.success(request, f'{updated} comment(s) approved.')
+        elif action == 'reject':
+            deleted, _ = pending.delete()
+            messages.success(request, f'{deleted} comment(s) rejected.')
+
+        url = reverse('blog:comment_moderation')
+        return redirect(f'{url}?after={after}' if after else url)
+
+    page = list(
+        Comment.objects.filter(is_approved=False, id__gt=after)
+        .select_related('author', 'post')
+        .order_by('id')[:MODERATION_PAGE_SIZE + 1]
+    )
+    has_next = len(page) > MODERATION_PAGE_SIZE
+    page = page[:MODERATION_PAGE_SIZE]
+
+    categories = Category.objects.all()
+
+    context = {
+        'comments': page,
+        'after': after,
+        'next_cursor': page[-1].id if has_next else None,
+        'categories': categories,
+    }
+    return render(request, 'blog/comment_moderation.html', context)
+
+
+# ------------------ AVATARS ------------------
+
+
+def avatar(request, username, size):
+    """
+    Serve a square avatar thumbnail, rendering it on first request
+    
+    URL: /avatars/<username>/<size>/?v=<hash>
+    WebP is served to browsers that accept it, JPEG otherwise.
+    """
+    if size not in settings.AVATAR_THUMBNAIL_SIZES:
+        raise Http404('Unsupported avatar size.')
+
+    profile = get_object_or_404(
+        UserProfile.objects.only('avatar', 'avatar_hash'),
+        user__username=username
+    )
+    if not profile.avatar or not profile.avatar_hash:
+        raise Http404('This user has no avatar.')
+
+    fmt = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+    name = get_thumbnail(profile, size, fmt)
+
+    response = FileResponse(
+        default_storage.open(name, 'rb'),
+        content_type=THUMBNAIL_FORMATS[fmt][1]
+    )
+    response['Vary'] = 'Accept'
+    if request.GET.get('v') == profile.avatar_hash[:12]:
+        # Versioned URLs change whenever the avatar does
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
 # ------------------ CRUD ------------------
 
 
+@cache_public_page
 def post_list(request):
     posts = Post.objects.filter(status=Post.Status.PUBLISHED)\
         .select_related('author', 'category')\
         .prefetch_related('tags')
 
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
 
     context = {
         "posts": posts,
         "categories": categories,
-        "authors": authors,
     }
     return render(request, "blog/posts.html", context)
 
 
 def post_detail_fbv(request, slug):
-    post = get_object_or_404(
-        Post.objects.select_related('author', 'category').prefetch_related('tags'),
+    # Count the view outside the page cache, so that cached renders are
+    # still counted (cache warm-up requests are not)
+    if not request.headers.get(WARMUP_HEADER):
+        view_recorder.record(slug)
+
+    return _post_detail_page(request, slug)
+
+
+@cache_public_page
+def _post_detail_page(request, slug):
+    post = Post.objects.select_related('author', 'category').prefetch_related('tags').filter(
         slug=slug,
         status=Post.Status.PUBLISHED
-    )
+    ).first()
 
-    post.views_count += 1
-    post.save(update_fields=['views_count'])
+    if post is None:
+        # Fall back to the archive tier for posts moved out of the hot table
+        post = get_archived_post(slug)
+        if post is None:
+            raise Http404('No post matches the given query.')
+        return _render_archived_post(request, post)
 
     comments = post.comments.filter(is_approved=True)
 
@@ -376,14 +853,34 @@ def post_detail_fbv(request, slug):
     ).exclude(id=post.id)[:3]
 
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
 
     context = {
         "post": post,
         "related_posts": related_posts,
         "comments": comments,
+        "comment_form": CommentForm(),
+        "categories": categories,
+    }
+    return render(request, "blog/post_detail.html", context)
+
+
+def _render_archived_post(request, post):
+    """Render an archived post read-only with the regular detail template."""
+    comments = post.comments.filter(is_approved=True)
+
+    related_posts = Post.objects.filter(
+        category_id=post.category_id,
+        status=Post.Status.PUBLISHED
+    )[:3]
+
+    categories = Category.objects.all()
+
+    context = {
+        "post": post,
+        "is_archived": True,
+        "related_posts": related_posts,
+        "comments": comments,
         "categories": categories,
-        "authors": authors,
     }
     return render(request, "blog/post_detail.html", context)
 
@@ -405,12 +902,10 @@ def post_create(request):
         form = PostForm()
 
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         "form": form,
         'categories': categories,
-        'authors': authors,
     }
     return render(request, "blog/post_form.html", context)
 
@@ -418,7 +913,7 @@ def post_create(request):
 @login_required(login_url='blog:login')
 def post_update(request, slug):
     """Update a blog post (only author can update)."""
-    post = get_object_or_404(Post, slug=slug)
+    post = get_object_or_404(Post.objects.exclude(status=Post.Status.DELETED), slug=slug)
 
     # Check if user is the post author
     if post.author != request.user:
@@ -428,28 +923,44 @@ def post_update(request, slug):
     if request.method == "POST":
         form = PostForm(request.POST, instance=post)
         if form.is_valid():
-            form.save()
-            messages.success(request, 'Post updated successfully!')
-            return redirect("blog:post_detail", slug=post.slug)
+            try:
+                form.save_changes()
+            except EditConflict:
+                # Keep the user's changes, now based on the latest version,
+                # so saving again knowingly replaces the other edit
+                post = Post.objects.get(pk=post.pk)
+                data = request.POST.copy()
+                data['base_version'] = post.version
+                form = PostForm(data, instance=post)
+                form.add_error(
+                    None,
+                    'Someone else saved this post after you opened it. Check the '
+                    'current version, then save again to replace it with your changes.'
+                )
+            else:
+                messages.success(request, 'Post updated successfully!')
+                return redirect("blog:post_detail", slug=post.slug)
     else:
         form = PostForm(instance=post)
 
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         "form": form,
         "post": post,
         'categories': categories,
-        'authors': authors,
     }
     return render(request, "blog/post_form.html", context)
 
 
 @login_required(login_url='blog:login')
 def post_delete(request, slug):
-    """Delete a blog post (only author can delete)."""
-    post = get_object_or_404(Post, slug=slug)
+    """Delete a blog post (only author can delete).
+
+    The post is only marked deleted here; ``purge_deleted`` removes it and
+    its comments later in small batches.
+    """
+    post = get_object_or_404(Post.objects.exclude(status=Post.Status.DELETED), slug=slug)
 
     # Check if user is the post author
     if post.author != request.user:
@@ -457,22 +968,38 @@ def post_delete(request, slug):
         return redirect("blog:post_detail", slug=post.slug)
 
     if request.method == "POST":
-        post.delete()
+        soft_delete_posts(Post.objects.filter(pk=post.pk))
         messages.success(request, 'Post deleted successfully!')
         return redirect("blog:posts")
 
     categories = Category.objects.all()
-    authors = User.objects.filter(posts__status='published').distinct()
     
     context = {
         "post": post,
         'categories': categories,
-        'authors': authors,
     }
     
     return render(request, "blog/post_confirm_delete.html", context)
 
 
+@login_required(login_url='blog:login')
+def account_delete(request):
+    """Close the logged-in user's account; ``purge_deleted`` removes its data later."""
+    if request.method == "POST":
+        close_account(request.user)
+        logout(request)
+        messages.success(request, 'Your account has been deleted.')
+        return redirect("blog:home")
+
+    categories = Category.objects.all()
+    
+    context = {
+        'categories': categories,
+    }
+    
+    return render(request, "blog/account_confirm_delete.html", context)
+
+
 # ================== AUTHENTICATION VIEWS (CBV) ==================
 
 
@@ -501,10 +1028,8 @@ class RegisterView(CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         categories = Category.objects.all()
-        authors = User.objects.filter(posts__status='published').distinct()
         context.update({
             'categories': categories,
-            'authors': authors,
         })
         return context
 
@@ -517,10 +1042,8 @@ class LoginView(LoginView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         categories = Category.objects.all()
-        authors = User.objects.filter(posts__status='published').distinct()
         context.update({
             'categories': categories,
-            'authors': authors,
         })
         return context
     
@@ -564,10 +1087,8 @@ class UserProfileUpdateView(UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         categories = Category.objects.all()
-        authors = User.objects.filter(posts__status='published').distinct()
         context.update({
             'categories': categories,
-            'authors': authors,
             'profile_user': self.request.user,
         })
         return context
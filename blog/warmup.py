@@ -0,0 +1,18 @@
+"""Pre-compile templates so the first requests after a deploy don't pay for it."""
+from pathlib import Path
+
+from django.template.loader import get_template
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates' / 'blog'
+
+
+def warm_templates():
+    """Load every ``blog/*.html`` template into the cached template loader.
+
+    Returns the names of the templates that were compiled.
+    """
+    names = sorted(f'blog/{path.name}' for path in TEMPLATE_DIR.glob('*.html'))
+    for name in names:
+        get_template(name)
+    return names
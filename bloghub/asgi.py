@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bloghub.settings')
 
 application = get_asgi_application()
+
+# Compile templates on worker boot instead of on the first requests
+from blog.warmup import warm_templates  # noqa: E402
+
+warm_templates()
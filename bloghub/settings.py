@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'blog',
 ]
 
@@ -47,6 +48,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.RateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -57,12 +59,20 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'blog.context_processors.navigation',
+            ],
+            # Compiled templates are kept for the life of the worker and
+            # pre-loaded by blog.warmup on boot (see bloghub/wsgi.py)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -86,6 +96,27 @@ DATABASES = {
 }
 
 
+# Cache
+# Use a shared backend (e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache,
+# CACHE_LOCATION=redis://127.0.0.1:6379) so workers, rate limits and
+# warm_cache all see the same entries.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Anonymous page cache lifetime; post changes expire pages immediately
+PAGE_CACHE_TIMEOUT = 300  # seconds
+STATS_CACHE_TIMEOUT = 60  # seconds
+
+# Expired entries are still served for this long while one request rebuilds them
+CACHE_STALE_TIMEOUT = 60  # seconds
+# How long a rebuild may hold the shared lock before others give up waiting
+CACHE_LOCK_TIMEOUT = 10  # seconds
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -128,13 +159,128 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic fingerprints assets and writes .gz/.br variants next to them
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'blog.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Serve collected static files from Django when there is no reverse proxy
+SERVE_STATIC = config('SERVE_STATIC', default=False, cast=bool)
+
+
+# Media files (user uploads)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Avatar processing
+AVATAR_MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # bytes
+AVATAR_MAX_PIXELS = 40_000_000
+AVATAR_MAX_DIMENSION = 1024
+AVATAR_THUMBNAIL_SIZES = (40, 96, 256)
+AVATAR_WORKERS = 2
+AVATAR_PROCESSING_TIMEOUT = 10  # seconds
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Sessions and logged-in users are read from the cache on each request.
+# Use a cache shared by all processes (Redis, Memcached) in production so a
+# logout or password change in one worker is seen by the others.
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
+
+# Sessions store the path of the backend that logged the user in; keep
+# ModelBackend listed so sessions created before the cached backend stay valid.
+AUTHENTICATION_BACKENDS = [
+    'blog.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_TIMEOUT = 300  # seconds
+
 # Authentication URLs
 LOGIN_URL = 'blog:login'
 LOGIN_REDIRECT_URL = 'blog:home'
 LOGOUT_REDIRECT_URL = 'blog:home'
+
+# Comment submission queue (comments are batch-inserted)
+COMMENT_QUEUE_BATCH_SIZE = 100
+COMMENT_QUEUE_FLUSH_INTERVAL = 2.0  # seconds
+
+# Post view counting (views are buffered and written in batches)
+VIEW_EVENTS_BATCH_SIZE = 500
+VIEW_EVENTS_FLUSH_INTERVAL = 10.0  # seconds
+
+# Author profile stats are cached until one of the author's posts changes
+AUTHOR_STATS_CACHE_TIMEOUT = 600  # seconds
+
+# Author directory, autocomplete and the navbar's top authors
+NAV_AUTHORS_SIZE = 10
+AUTHOR_DIRECTORY_PAGE_SIZE = 48
+AUTHOR_DIRECTORY_CACHE_TIMEOUT = 600  # seconds
+
+# Post search (full-text, topped up with trigram matches when results are sparse)
+SEARCH_RESULTS_LIMIT = 100
+SEARCH_FUZZY_THRESHOLD = 5
+SEARCH_FUZZY_LIMIT = 20
+SEARCH_CACHE_TIMEOUT = 600  # seconds
+SEARCH_PAGE_SIZE = 12
+
+# Popular search queries (counted in batches, precomputed by refresh_search_cache)
+SEARCH_LOG_BATCH_SIZE = 500
+SEARCH_LOG_FLUSH_INTERVAL = 30.0  # seconds
+SEARCH_POPULAR_WINDOW_DAYS = 7
+SEARCH_PRECOMPUTE_SIZE = 100
+
+# Admin performance mode for very large tables (PostgreSQL only): estimated
+# changelist counts, no date hierarchy, full-text search, cached filter choices
+ADMIN_PERFORMANCE_MODE = config('ADMIN_PERFORMANCE_MODE', default=False, cast=bool)
+ADMIN_ESTIMATE_THRESHOLD = 100000  # rows before unfiltered counts are estimated
+ADMIN_COUNT_LIMIT = 10000  # filtered changelists count at most this many rows
+ADMIN_CHOICES_CACHE_TIMEOUT = 300  # seconds
+
+# Date archive (month counts are maintained in MonthBucket)
+ARCHIVE_PAGE_SIZE = 10
+ARCHIVE_WIDGET_MONTHS = 12
+ARCHIVE_CACHE_TIMEOUT = 600  # seconds
+
+# Post revision history: compressed deltas with a full snapshot every N revisions
+REVISION_SNAPSHOT_INTERVAL = 20
+REVISION_FETCH_SIZE = 20  # revisions read per round trip when rebuilding one
+
+# Search box suggestions (per-process in-memory prefix index)
+SUGGEST_REFRESH_INTERVAL = 30  # seconds between checks for changed posts
+SUGGEST_REBUILD_INTERVAL = 3600  # seconds between full rebuilds
+
+# View analytics: append-only event log, rolled up by the rollup_analytics command
+ANALYTICS_LOG_DIR = config('ANALYTICS_LOG_DIR', default=str(BASE_DIR / 'analytics'))
+ANALYTICS_HOURLY_RETENTION_DAYS = 14  # daily rollups are kept indefinitely
+ANALYTICS_CACHE_TIMEOUT = 300  # seconds
+
+# Trending lists (rebuilt by the compute_trending command)
+TRENDING_SIZE = 20
+TRENDING_WINDOW_HOURS = 7 * 24
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_CACHE_TIMEOUT = 600  # seconds
+
+# Rate limiting (token buckets per client and URL name)
+# Use 'blog.ratelimit.MemoryStore' for tests or a single-process server.
+RATELIMIT_STORE = 'blog.ratelimit.CacheStore'
+RATELIMITS = {
+    'blog:contact': {'rate': '5/m', 'methods': ['POST']},
+    'blog:register': {'rate': '10/h', 'methods': ['POST']},
+    'blog:login': {'rate': '10/m', 'methods': ['POST']},
+    'blog:post_create': {'rate': '20/h', 'methods': ['POST'], 'key': 'user'},
+    'blog:comment_create': {'rate': '10/m', 'methods': ['POST'], 'key': 'user'},
+    'blog:search_posts': {'rate': '30/m'},
+    'blog:author_autocomplete': {'rate': '60/m'},
+    'blog:search_suggest': {'rate': '120/m'},
+}
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bloghub.settings')
 
 application = get_wsgi_application()
+
+# Compile templates on worker boot instead of on the first requests
+from blog.warmup import warm_templates  # noqa: E402
+
+warm_templates()
@@ -0,0 +1,52 @@
+// Navbar search suggestions, fetched from the search_suggest endpoint
+(function () {
+    var input = document.getElementById('navbar-search');
+    var box = document.getElementById('navbar-search-suggestions');
+    if (!input || !box) {
+        return;
+    }
+
+    var icons = { post: '📄', tag: '🏷️', category: '📂', author: '✍️' };
+    var cache = {};
+    var timer;
+
+    function render(results) {
+        box.innerHTML = '';
+        results.forEach(function (item) {
+            var link = document.createElement('a');
+            link.className = 'list-group-item list-group-item-action';
+            link.href = item.url;
+            link.textContent = (icons[item.kind] || '') + ' ' + item.label;
+            box.appendChild(link);
+        });
+        box.classList.toggle('d-none', results.length === 0);
+    }
+
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        var q = input.value.trim().toLowerCase();
+        if (q.length < 2) {
+            render([]);
+            return;
+        }
+        if (cache[q]) {
+            render(cache[q]);
+            return;
+        }
+        timer = setTimeout(function () {
+            fetch(input.dataset.suggestUrl + '?q=' + encodeURIComponent(q))
+                .then(function (response) { return response.ok ? response.json() : { results: [] }; })
+                .then(function (data) {
+                    cache[q] = data.results;
+                    if (input.value.trim().toLowerCase() === q) {
+                        render(data.results);
+                    }
+                });
+        }, 120);
+    });
+
+    input.addEventListener('blur', function () {
+        // Let clicks on a suggestion land before hiding the list
+        setTimeout(function () { render([]); }, 150);
+    });
+})();